@@ -15,12 +15,30 @@ import sys
 import json
 import shutil
 import re
+import platform
+import hashlib
+import sqlite3
+import time
+import threading
+import pickle
+import tempfile
+from collections import ChainMap, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import NamedTuple
 
 import streamlit as st
 import logging
 
+# orjson (선택): 대용량 아카이브 JSON 디코딩 가속
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Logger setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("App")
@@ -33,36 +51,85 @@ sys.path.insert(0, str(SCRIPT_DIR))
 sys.path.insert(0, str(SCRIPT_DIR / "utils"))
 
 # 환경 변수 로드
-from dotenv import load_dotenv
+from dotenv import load_dotenv, dotenv_values
 ENV_FILE = KIT_ROOT / ".env"
 load_dotenv(ENV_FILE)
 
+
+def file_mtime_ns(path: Path) -> int:
+    """파일 수정 시각 (캐시 키 용도, 파일이 없으면 0)"""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def atomic_write_text(path: Path, text: str):
+    """
+    임시 파일에 한 번에 기록 후 교체 (쓰기 도중 중단되어도 기존 파일이 깨지지 않음)
+    """
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """
+    atomic_write_text의 바이트 버전
+
+    임시 파일 이름은 호출마다 고유하므로 여러 세션이 같은 파일을 동시에 써도
+    서로의 임시 파일을 덮어쓰지 않습니다 (마지막으로 교체한 쪽이 남음).
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            shutil.copymode(path, tmp_path)  # .env 등 기존 권한 유지
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+@st.cache_data(show_spinner=False)
+def read_env_file(mtime_ns: int) -> dict:
+    """.env 파싱 결과 (파일 수정 시각이 바뀔 때만 다시 읽음)"""
+    if not mtime_ns:
+        return {}
+    return dict(dotenv_values(ENV_FILE))
+
+
+def get_env_vault_path() -> str:
+    """.env에 저장된 OBSIDIAN_VAULT 경로 (캐시된 파싱 결과 사용)"""
+    return (read_env_file(file_mtime_ns(ENV_FILE)).get("OBSIDIAN_VAULT") or "").strip()
+
+
+# 전역 설정 기본값 (키 목록이기도 함)
+GLOBAL_SETTING_DEFAULTS = {
+    "ANTHROPIC_API_KEY": "",
+    "OPENAI_API_KEY": "",
+    "GOOGLE_API_KEY": "",
+    "RAG_MODEL": "gemini-2.5-flash",
+    "RAG_MAX_TOKENS": "4096",
+    "APP_TITLE": "Kerygma Th Library",
+    "OBSIDIAN_VAULT": "",
+}
+
+
 # 전역 설정 로드
 def load_global_settings():
-    settings = {
-        "ANTHROPIC_API_KEY": os.getenv("ANTHROPIC_API_KEY", ""),
-        "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", ""),
-        "GOOGLE_API_KEY": os.getenv("GOOGLE_API_KEY", ""),
-        "RAG_MODEL": os.getenv("RAG_MODEL", "gemini-2.5-flash"),
-        "RAG_MAX_TOKENS": os.getenv("RAG_MAX_TOKENS", "4096"),
-        "APP_TITLE": os.getenv("APP_TITLE", "Kerygma Th Library"),
-        "OBSIDIAN_VAULT": os.getenv("OBSIDIAN_VAULT", ""),
+    # 우선순위: .env 파일(실시간 반영용) > 환경 변수 > 기본값
+    file_values = {
+        k: v for k, v in read_env_file(file_mtime_ns(ENV_FILE)).items() if v is not None
     }
-    # .env 파일이 있으면 우선적으로 덮어쓰기 (실시간 반영용)
-    if ENV_FILE.exists():
-        with open(ENV_FILE, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    key = key.strip()
-                    value = value.strip().strip('"').strip("'")
-                    if key in settings:
-                        settings[key] = value
-    return settings
+    layered = ChainMap(file_values, os.environ, GLOBAL_SETTING_DEFAULTS)
+    return {key: layered[key] for key in GLOBAL_SETTING_DEFAULTS}
 
 GLOBAL_SETTINGS = load_global_settings()
 APP_TITLE = GLOBAL_SETTINGS["APP_TITLE"]
+PLATFORM = platform.system()
 
 # 경로 설정 (상대 경로는 KIT_ROOT 기준으로 변환)
 def resolve_path(env_var: str, default: str) -> Path:
@@ -108,29 +175,71 @@ def load_searcher(_db_path: str):
     # 임베딩 모델 로드
     embedder = load_embedder()
     
-    # Chroma DB 연결 (embedder 객체 직접 전달)
+    # Chroma DB 연결 (embedder 객체 직접 전달, 앱 공용 클라이언트 재사용)
     vector_db = Chroma(
-        persist_directory=_db_path,
+        client=get_chroma_client(_db_path),
         embedding_function=embedder,
-        collection_name="theology_library"
+        collection_name="theology_library",
+        collection_metadata={"hnsw:space": "cosine"}
     )
     
     searcher = TheologySearcher(vector_db)
     
-    # BM25 구성을 위해 전체 문서 로드 (하이브리드 검색용)
-    try:
-        results = vector_db.get(include=["documents", "metadatas"])
-        if results and results["documents"]:
-            all_docs = [
-                Document(page_content=d, metadata=m) 
-                for d, m in zip(results["documents"], results["metadatas"])
-            ]
-            searcher.build_ensemble(all_docs)
-    except Exception as e:
-        logger.error(f"Failed to build ensemble: {e}")
+    # BM25 인덱스: 같은 데이터 버전으로 저장된 것이 있으면 전체 문서 로드 생략
+    version = data_version()
+    bm25_retriever = load_cached_bm25(version)
+    if bm25_retriever is None:
+        # BM25 구성을 위해 전체 문서 로드 (하이브리드 검색용)
+        try:
+            results = vector_db.get(include=["documents", "metadatas"])
+            if results and results["documents"]:
+                all_docs = [
+                    Document(page_content=d, metadata=m) 
+                    for d, m in zip(results["documents"], results["metadatas"])
+                ]
+                bm25_retriever = TheologySearcher.build_bm25(all_docs)
+                store_cached_bm25(bm25_retriever, version)
+        except Exception as e:
+            logger.error(f"Failed to build ensemble: {e}")
+
+    if bm25_retriever is not None:
+        searcher.build_ensemble(bm25_retriever=bm25_retriever)
         
     return searcher
 
+
+# 하이브리드 검색기의 BM25 인덱스 저장 위치 (DB 경로/데이터 버전이 같을 때만 재사용)
+BM25_CACHE_PATH = KIT_ROOT / ".bm25_retriever.pkl"
+
+
+def load_cached_bm25(version: tuple):
+    """
+    저장된 BM25 검색기 (현재 DB와 맞지 않거나 읽을 수 없으면 None)
+
+    pickle은 임의 코드를 실행할 수 있으므로 이 앱이 직접 쓴 로컬 파일만 읽습니다.
+    (키트 폴더는 사용자 본인의 동기화 폴더이며, 다른 곳의 파일을 여기에 두지 말 것)
+    """
+    try:
+        with open(BM25_CACHE_PATH, "rb") as f:
+            data = pickle.load(f)
+    except Exception:  # 파일 없음, 손상, 라이브러리 버전 변경 등 → 다시 구성
+        return None
+    if data.get("db_path") != str(DB_PATH) or data.get("data_version") != version:
+        return None
+    return data.get("retriever")
+
+
+def store_cached_bm25(retriever, version: tuple):
+    """BM25 검색기 저장 (실패해도 다음 실행 시 다시 구성하므로 무시)"""
+    try:
+        payload = pickle.dumps(
+            {"db_path": str(DB_PATH), "data_version": version, "retriever": retriever},
+            protocol=pickle.HIGHEST_PROTOCOL
+        )
+        atomic_write_bytes(BM25_CACHE_PATH, payload)
+    except Exception as e:
+        logger.warning(f"BM25 cache not saved: {e}")
+
 @st.cache_resource
 def load_query_expander():
     """3중 언어 쿼리 확장기 로드"""
@@ -140,16 +249,32 @@ def load_query_expander():
     except ImportError:
         return None
 
+@st.cache_resource
+def load_dual_search_engine(_db_path: str, _archive_path: str, use_trilingual: bool):
+    """이중 검색 엔진 로드 (임베딩 모델 / DB 연결을 검색 간 재사용)"""
+    from utils.dual_search import DualSearchEngine
+    return DualSearchEngine(
+        db_path=_db_path,
+        archive_path=_archive_path,
+        use_trilingual=use_trilingual,
+        client=get_chroma_client(_db_path)
+    )
+
+@st.cache_resource
+def get_chroma_client(_db_path: str):
+    """ChromaDB PersistentClient (SQLite/HNSW 파일을 한 번만 열고 재사용)"""
+    import chromadb
+    return chromadb.PersistentClient(path=_db_path)
+
 @st.cache_resource
 def load_db(_db_path: str):
     """ChromaDB 연결"""
-    import chromadb
     db_path = Path(_db_path)
     if not db_path.exists():
         return None, None
     
     try:
-        client = chromadb.PersistentClient(path=_db_path)
+        client = get_chroma_client(_db_path)
         collection = client.get_collection(name="theology_library")
         # [v4.0.1] DB 무결성 확인 (Reset 직후 테이블 없음 에러 방지)
         _ = collection.count() 
@@ -157,82 +282,281 @@ def load_db(_db_path: str):
     except Exception:
         return None, None
 
-@st.cache_data(ttl=60)
-def load_lemma_index(_index_path: str):
-    """Lemma 인덱스 로드 (v1.0 및 v2.0 형식 모두 지원)"""
-    index_path = Path(_index_path)
-    if not index_path.exists():
+@st.cache_data
+def load_lemma_index(_index_path: str, mtime_ns: int):
+    """
+    Lemma 인덱스 로드 (v1.0 및 v2.0 형식 모두 지원)
+
+    mtime_ns를 캐시 키로 사용하므로 파일이 바뀔 때만 다시 파싱합니다.
+    """
+    from utils.lemma_index import read_lemma_index
+    return read_lemma_index(_index_path)
+
+
+def db_version() -> tuple:
+    """ChromaDB 변경 감지용 키 (SQLite 본 파일 + WAL 수정 시각, 프로세스 내 캐시 전용)"""
+    return (
+        file_mtime_ns(DB_PATH / "chroma.sqlite3"),
+        file_mtime_ns(DB_PATH / "chroma.sqlite3-wal"),
+    )
+
+
+def data_version() -> tuple:
+    """
+    디스크에 저장하는 캐시(소스 요약, BM25)용 DB 데이터 버전: (청크 수, 쓰기 스탬프)
+
+    chroma.sqlite3의 수정 시각은 클라이언트를 여는 것만으로도 바뀌어 재시작 후에는
+    항상 달라지므로, 데이터가 바뀔 때만 바뀌는 값을 따로 사용합니다.
+    스탬프는 앱/프로세서가 DB에 쓸 때 갱신하고, 청크 수는 스탬프를 남기지 않는
+    외부 도구(Colab 노트북, db_manager 등)의 변경을 잡아냅니다.
+    """
+    from pipeline.data_version import read_data_version
+    _, collection = load_db(str(DB_PATH))
+    return (collection.count() if collection else 0, read_data_version(DB_PATH))
+
+
+def mark_db_changed():
+    """DB에 쓴 직후 호출: 디스크 캐시가 이전 데이터로 재사용되지 않도록 스탬프 갱신"""
+    from pipeline.data_version import bump_data_version
+    try:
+        bump_data_version(DB_PATH)
+    except OSError as e:
+        logger.warning(f"DB data version not updated: {e}")
+
+
+@st.cache_data(show_spinner=False)
+def list_archive_files(_archive_dir: str, dir_mtime_ns: int) -> frozenset:
+    """아카이브 폴더의 청킹 JSON 파일명 (폴더 수정 시각이 바뀔 때만 다시 조회)"""
+    archive_dir = Path(_archive_dir)
+    if not archive_dir.exists():
+        return frozenset()
+    return frozenset(f.name for f in archive_dir.glob("*.json") if not f.name.startswith("lemma_"))
+
+
+INBOX_EXTENSIONS = (".pdf", ".epub", ".txt")
+
+
+@st.cache_data(ttl=1, show_spinner=False)
+def path_exists(path: str) -> bool:
+    """경로 존재 여부 (재실행마다 반복되는 stat을 1초 동안 재사용, 원격/NAS 경로 대비)"""
+    return Path(path).exists()
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def list_inbox_files(_inbox_dir: str) -> list:
+    """
+    Inbox 하위의 처리 대상 파일 (한 번의 디렉터리 순회, 5초 캐시)
+
+    Returns: [(경로, 크기(bytes), Sidecar 경로 또는 None), ...]
+    Sidecar는 같은 폴더의 파일명 목록에서 찾으므로 추가 stat 호출이 없습니다.
+    """
+    found = []
+    for root, dirs, files in os.walk(_inbox_dir):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        names = set(files)
+        for name in files:
+            if name.startswith(".") or not name.lower().endswith(INBOX_EXTENSIONS):
+                continue
+            path = Path(root) / name
+            sidecar = None
+            for candidate in (name + ".json", path.stem + ".json"):
+                if candidate in names:
+                    sidecar = path.with_name(candidate)
+                    break
+            found.append((path, path.stat().st_size, sidecar))
+    return sorted(found)
+
+
+# 소스 유형 분류 (소스 이름 접두어 기준, 예: "TRE_Bd04" → 신학백과)
+SOURCE_TYPES = {
+    "TRE": "신학백과", "RGG": "신학백과", "EKL": "신학백과",
+    "TDNT": "성서사전", "NIDNTT": "성서사전", "EDNT": "성서사전",
+    "ThWAT": "성서사전", "EWNT": "성서사전",
+    "HWPh": "철학사전",
+    "KD": "교의학",
+}
+# 긴 접두어 우선, 뒤에 영문자가 이어지면 다른 이름으로 간주
+SOURCE_TYPE_RE = re.compile(
+    "(" + "|".join(sorted(map(re.escape, SOURCE_TYPES), key=len, reverse=True)) + ")(?![A-Za-z])"
+)
+
+
+def classify_source(source: str) -> str:
+    """소스 이름으로 유형 추론 (일치하는 접두어가 없으면 "기타")"""
+    match = SOURCE_TYPE_RE.match(source)
+    return SOURCE_TYPES[match.group(1)] if match else "기타"
+
+
+HIGHLIGHT_MARK = "<mark style='background-color: #FEF08A; border-radius: 2px; padding: 0 2px;'>{}</mark>"
+
+
+@st.cache_resource(max_entries=64)
+def get_highlight_pattern(query: str):
+    """
+    검색어 키워드(2자 이상)를 하나의 정규식으로 컴파일 (쿼리당 1회)
+
+    긴 키워드를 먼저 두어 겹치는 키워드는 더 긴 쪽으로 강조합니다.
+    강조할 키워드가 없으면 None.
+    """
+    keywords = sorted({kw for kw in query.split() if len(kw) > 1}, key=len, reverse=True)
+    if not keywords:
         return None
-    with open(index_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    # v2.0 형식인지 확인 (entries 키가 있는지)
-    if "entries" in data:
-        return data
-
-    # v1.0 형식 → v2.0 형식으로 변환
-    # v1.0: {"lemma": [{file, page}, ...], ...}
-    # v2.0: {"entries": {...}, "by_category": {}, "by_source": {...}, "updated_at": ...}
-    entries = {}
-    by_source = {}
-
-    for lemma, occurrences in data.items():
-        entries[lemma] = []
-        for occ in occurrences:
-            source_file = occ.get("file", "")
-            source_name = source_file.replace(".json", "") if source_file else "Unknown"
-            page = occ.get("page", 0)
-
-            entries[lemma].append({
-                "file": source_file,
-                "page": page,
-                "source": source_name
-            })
-
-            # by_source 집계
-            if source_name not in by_source:
-                by_source[source_name] = {"count": 0, "volumes": []}
-            by_source[source_name]["count"] += 1
+    return re.compile("|".join(re.escape(kw) for kw in keywords), re.IGNORECASE)
 
-    return {
-        "version": "1.0 (converted)",
-        "updated_at": datetime.now().isoformat(),
-        "entries": entries,
-        "by_category": {},  # v1.0에는 카테고리 정보 없음
-        "by_source": by_source
-    }
+
+def highlight_keywords(text: str, pattern) -> str:
+    """본문을 한 번만 훑으며 일치 부분을 원문 대소문자 그대로 <mark>로 감쌈"""
+    if pattern is None:
+        return text
+    return pattern.sub(lambda m: HIGHLIGHT_MARK.format(m.group(0)), text)
+
+
+@st.cache_data(show_spinner=False)
+def build_source_table(db_version: tuple):
+    """
+    통계 페이지 소스 테이블 (청크 수 내림차순)
+
+    열 단위로 DataFrame을 구성하고, Arrow 기반 열을 사용하므로
+    st.dataframe 전송 시 object → Arrow 변환이 생략됩니다.
+    db_version이 같으면 재실행 시 다시 구성하지 않습니다.
+    """
+    import pandas as pd
+    import pyarrow as pa
+
+    by_source = get_sources_from_db(db_version)
+    sources = sorted(by_source, key=lambda src: by_source[src].get("count", 0), reverse=True)
+    arrow_str, arrow_int = pd.ArrowDtype(pa.string()), pd.ArrowDtype(pa.int64())
+    return pd.DataFrame({
+        "소스": pd.array(sources, dtype=arrow_str),
+        "유형": pd.array([classify_source(src) for src in sources], dtype=arrow_str),
+        "권수": pd.array([len(by_source[src].get("volumes") or [1]) for src in sources], dtype=arrow_int),
+        "청크": pd.array([by_source[src].get("count", 0) for src in sources], dtype=arrow_int),
+    })
+
+
+@st.fragment
+def render_source_table(df):
+    """
+    통계 페이지의 소스 검색/유형 필터와 테이블
+
+    필터 위젯을 바꿔도 페이지 전체가 아닌 이 fragment만 다시 실행되므로
+    DB 조회와 DataFrame 구성을 반복하지 않습니다.
+    """
+    # 필터 UI
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        search_source = st.text_input("소스 검색", placeholder="예: TRE, RGG...", key="source_search")
+    with col2:
+        all_types = ["전체"] + sorted(df["유형"].unique().tolist())
+        selected_type = st.selectbox("유형 필터", all_types, key="type_filter")
+
+    # 필터 적용
+    filtered_df = df.copy()
+    if search_source:
+        filtered_df = filtered_df[filtered_df["소스"].str.contains(search_source, case=False)]
+    if selected_type != "전체":
+        filtered_df = filtered_df[filtered_df["유형"] == selected_type]
+
+    # 테이블 표시 (상위 10개 + 더보기)
+    show_all = st.checkbox(f"전체 표시 ({len(filtered_df)}개)", key="show_all_sources")
+    display_df = filtered_df if show_all else filtered_df.head(10)
+
+    st.dataframe(
+        display_df,
+        column_config={
+            "소스": st.column_config.TextColumn("소스", width="medium"),
+            "유형": st.column_config.TextColumn("유형", width="small"),
+            "권수": st.column_config.NumberColumn("권수", format="%d"),
+            "청크": st.column_config.NumberColumn("청크", format="%d"),
+        },
+        hide_index=True,
+        width="stretch"
+    )
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def get_collection_count(db_version: tuple) -> int:
+    """전체 청크 수 (DB 변경 시 또는 최대 5초마다 다시 조회)"""
+    _, collection = load_db(str(DB_PATH))
+    return collection.count() if collection else 0
+
+
+# 소스 집계 시 한 번에 가져올 메타데이터 수
+SOURCE_SCAN_PAGE_SIZE = 5000
+# 소스별 청크 수 요약 (데이터 버전이 같으면 전체 메타데이터 스캔 대신 사용, 재시작 후에도 유효)
+SOURCES_SUMMARY_PATH = KIT_ROOT / ".sources_summary.json"
+
+
+def read_sources_summary(version: tuple):
+    """저장된 소스 요약 (현재 DB 경로/데이터 버전과 일치할 때만 반환, 아니면 None)"""
+    try:
+        data = json.loads(SOURCES_SUMMARY_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if data.get("db_path") != str(DB_PATH) or data.get("data_version") != list(version):
+        return None
+    return data.get("sources")
+
+
+def write_sources_summary(sources: dict, version: tuple):
+    """소스 요약 저장 (실패해도 다음 조회 시 전체 스캔으로 복구되므로 무시)"""
+    summary = {"db_path": str(DB_PATH), "data_version": list(version), "sources": sources}
+    try:
+        atomic_write_text(SOURCES_SUMMARY_PATH, json.dumps(summary, ensure_ascii=False))
+    except OSError:
+        pass
 
 
-def get_sources_from_db() -> dict:
+def update_sources_summary(source_name: str, count: int, version_before: tuple):
+    """DB 변경(및 mark_db_changed) 직후 해당 소스의 청크 수만 갱신해 요약을 새 데이터 버전으로 저장"""
+    sources = get_sources_from_db(version_before)
+    if count:
+        sources[source_name] = {"count": count}
+    else:
+        sources.pop(source_name, None)
+    write_sources_summary(sources, data_version())
+
+
+@st.cache_data(show_spinner=False)
+def get_sources_from_db(db_version: tuple) -> dict:
     """
     ChromaDB에서 직접 소스 목록과 청크 수 조회
 
+    db_version이 바뀔 때(인덱싱/삭제 등 DB 쓰기)만 다시 집계합니다.
+    데이터 버전이 같은 요약 파일이 있으면 (재시작 후에도) 스캔 없이 그대로 사용합니다.
+
     Returns:
         {"source_name": {"count": int}, ...}
     """
-    import chromadb
     from collections import defaultdict
 
-    try:
-        client = chromadb.PersistentClient(path=str(DB_PATH))
-        collection = client.get_collection(name="theology_library")
-        _ = collection.count() # Health check
-    except Exception:
-        return {}
-
-    # 모든 문서의 메타데이터 조회
-    results = collection.get(include=["metadatas"])
+    # 스캔 전에 버전을 잡아 두어, 스캔 도중 DB가 바뀌면 다음 조회에서 다시 집계되도록 함
+    version = data_version()
+    summary = read_sources_summary(version)
+    if summary is not None:
+        return summary
 
-    if not results.get("metadatas"):
+    # 캐시된 DB 연결 재사용 (load_db가 상태 확인까지 수행)
+    _, collection = load_db(str(DB_PATH))
+    if collection is None:
         return {}
 
-    # 소스별 집계
+    # 메타데이터를 페이지 단위로 조회하며 소스별 집계 (전체 결과를 한 번에 올리지 않음)
     source_counts = defaultdict(int)
-    for meta in results["metadatas"]:
-        source = meta.get("source", "Unknown")
-        source_counts[source] += 1
-
-    return {source: {"count": count} for source, count in source_counts.items()}
+    offset = 0
+    while True:
+        page = collection.get(include=["metadatas"], limit=SOURCE_SCAN_PAGE_SIZE, offset=offset)
+        metadatas = page.get("metadatas") or []
+        for meta in metadatas:
+            source = (meta or {}).get("source", "Unknown")
+            source_counts[source] += 1
+        if len(metadatas) < SOURCE_SCAN_PAGE_SIZE:
+            break
+        offset += SOURCE_SCAN_PAGE_SIZE
+
+    sources = {source: {"count": count} for source, count in source_counts.items()}
+    write_sources_summary(sources, version)
+    return sources
 
 
 def delete_source_from_db(source_name: str) -> int:
@@ -245,33 +569,36 @@ def delete_source_from_db(source_name: str) -> int:
     Returns:
         삭제된 청크 수
     """
-    import chromadb
-
-    try:
-        client = chromadb.PersistentClient(path=str(DB_PATH))
-        collection = client.get_collection(name="theology_library")
-        _ = collection.count() # Health check
-    except Exception:
+    _, collection = load_db(str(DB_PATH))
+    if collection is None:
         return 0
 
-    # 해당 소스의 모든 문서 ID 조회
-    results = collection.get(
-        where={"source": source_name},
-        include=[]
-    )
-
-    ids_to_delete = results.get("ids", [])
-    if not ids_to_delete:
+    # 삭제될 청크 수는 캐시된 소스 집계에서 확인 (ID 목록 조회 생략)
+    version_before = db_version()
+    deleted_count = get_sources_from_db(version_before).get(source_name, {}).get("count", 0)
+    if not deleted_count:
         return 0
 
-    # 삭제 실행
-    collection.delete(ids=ids_to_delete)
+    # where 조건으로 한 번에 삭제
+    collection.delete(where={"source": source_name})
+    mark_db_changed()
+    update_sources_summary(source_name, 0, version_before)
 
     # 캐시 무효화
     load_db.clear()
+    load_dual_search_engine.clear()
     load_lemma_index.clear()
+    get_sources_from_db.clear()
+    get_collection_count.clear()
+
+    return deleted_count
 
-    return len(ids_to_delete)
+
+# 재인덱싱 배치 크기 (MPS는 VRAM 한계로 작게 유지)
+REINDEX_ENCODE_BATCH = 64
+REINDEX_ENCODE_BATCH_MPS = 8
+REINDEX_ENCODE_BATCH_CUDA = 128  # FP16 가중치라 더 큰 배치도 VRAM 여유
+REINDEX_UPSERT_BATCH = 1000
 
 
 def reindex_source(source_name: str) -> str:
@@ -284,41 +611,38 @@ def reindex_source(source_name: str) -> str:
     Returns:
         결과 메시지
     """
-    import chromadb
-    from sentence_transformers import SentenceTransformer
-
     # 1. 아카이브 파일 확인
     archive_file = ARCHIVE_DIR / f"{source_name}.json"
     if not archive_file.exists():
         raise FileNotFoundError(f"아카이브 파일 없음: {archive_file}")
 
-    # 2. 기존 데이터 삭제
+    # 2. 기존 데이터 삭제 (없는 소스는 delete_source_from_db가 캐시된 집계만 보고 0 반환)
     deleted_count = delete_source_from_db(source_name)
 
     # 3. 아카이브에서 데이터 로드
-    with open(archive_file, "r", encoding="utf-8") as f:
-        first_char = f.read(1)
-        f.seek(0)
+    with open(archive_file, "rb") as f:
+        raw_data = orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
 
-        if first_char == "[":
-            data = json.load(f)
-        else:
-            raw_data = json.load(f)
-            if isinstance(raw_data, dict) and "chunks" in raw_data:
-                data = raw_data["chunks"]
-            elif isinstance(raw_data, dict):
-                data = [raw_data]
-            else:
-                data = [raw_data]
+    if isinstance(raw_data, list):
+        data = raw_data
+    elif isinstance(raw_data, dict) and "chunks" in raw_data:
+        data = raw_data["chunks"]
+    else:
+        data = [raw_data]
 
     if not data:
         return f"삭제 {deleted_count}개, 데이터 없음"
 
-    # 4. 모델 및 DB 연결
-    model = SentenceTransformer("paraphrase-multilingual-MiniLM-L12-v2")
+    # 4. 모델 및 DB 연결 (DB와 동일한 BGE-M3, 캐시된 인스턴스 재사용)
+    embedder = load_embedder()
+    embedder.load_model()
+    model = embedder.model
     try:
-        client = chromadb.PersistentClient(path=str(DB_PATH))
-        collection = client.get_or_create_collection(name="theology_library")
+        client = get_chroma_client(str(DB_PATH))
+        collection = client.get_or_create_collection(
+            name="theology_library",
+            metadata={"hnsw:space": "cosine"}  # 정규화 벡터 → 코사인 거리
+        )
     except Exception as e:
         return f"DB 연결 실패: {e}"
 
@@ -326,43 +650,77 @@ def reindex_source(source_name: str) -> str:
     documents = []
     ids = []
     metadatas = []
+    seen_ids = set()
+    indexed_at = datetime.now().isoformat()
 
     for item in data:
-        unique_id = f"{source_name}_{item.get('id', hash(item.get('text', '')))}"
-        meta = item.get("metadata", {})
+        # 아카이브 청크는 "content", 구형 포맷은 "text" 키 사용
+        text = item.get("text") or item.get("content")
+        if not text:
+            continue
+
+        # 프로세스마다 값이 바뀌는 hash() 대신 내용 기반 고정 ID (upsert 멱등성 보장)
+        chunk_key = item.get("id") or hashlib.blake2b(text.encode("utf-8"), digest_size=12).hexdigest()
+        unique_id = f"{source_name}_{chunk_key}"
+        if unique_id in seen_ids:
+            continue
+        seen_ids.add(unique_id)
+
+        # None 및 리스트 처리 (Chroma 메타데이터는 스칼라만 허용)
+        meta = {
+            k: "" if v is None else ", ".join(map(str, v)) if isinstance(v, list) else v
+            for k, v in (item.get("metadata") or {}).items()
+        }
         meta["source"] = source_name
-        meta["indexed_at"] = datetime.now().isoformat()
+        meta["indexed_at"] = indexed_at
         meta["reindexed"] = True  # 재인덱싱 표시
 
-        # None 및 리스트 처리
-        for k, v in list(meta.items()):
-            if v is None:
-                meta[k] = ""
-            elif isinstance(v, list):
-                meta[k] = ", ".join(str(x) for x in v)
-
-        documents.append(item["text"])
+        documents.append(text)
         ids.append(unique_id)
         metadatas.append(meta)
 
-    # 배치 처리
-    batch_size = 10
-    for i in range(0, len(documents), batch_size):
-        batch_docs = documents[i:i + batch_size]
-        batch_ids = ids[i:i + batch_size]
-        batch_meta = metadatas[i:i + batch_size]
-
-        embeddings = model.encode(batch_docs).tolist()
-        collection.upsert(
-            ids=batch_ids,
-            documents=batch_docs,
-            embeddings=embeddings,
-            metadatas=batch_meta
-        )
+    if not documents:
+        return f"삭제 {deleted_count}개, 데이터 없음"
+
+    # 배치 처리: 배치 i를 인코딩하는 동안 배치 i-1을 별도 스레드에서 upsert
+    # (모델 연산과 SQLite/HNSW 쓰기가 번갈아 쉬지 않도록 겹쳐서 실행)
+    encode_batch = {
+        "mps": REINDEX_ENCODE_BATCH_MPS,
+        "cuda": REINDEX_ENCODE_BATCH_CUDA,
+    }.get(embedder.device, REINDEX_ENCODE_BATCH)
+
+    version_before = db_version()
+    with ThreadPoolExecutor(max_workers=1) as upserter:
+        pending = None
+        for i in range(0, len(documents), REINDEX_UPSERT_BATCH):
+            batch = slice(i, i + REINDEX_UPSERT_BATCH)
+            embeddings = model.encode(
+                documents[batch],
+                batch_size=encode_batch,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+            if pending is not None:
+                pending.result()  # 이전 배치 완료 대기 (예외 전파)
+            pending = upserter.submit(
+                collection.upsert,
+                ids=ids[batch],
+                documents=documents[batch],
+                embeddings=embeddings.tolist(),
+                metadatas=metadatas[batch]
+            )
+        if pending is not None:
+            pending.result()
+    mark_db_changed()
+    update_sources_summary(source_name, len(documents), version_before)
 
     # 캐시 무효화
     load_db.clear()
+    load_dual_search_engine.clear()
     load_lemma_index.clear()
+    get_sources_from_db.clear()
+    get_collection_count.clear()
 
     return f"삭제 {deleted_count}개 → 새로 인덱싱 {len(documents)}개"
 
@@ -374,37 +732,29 @@ def check_duplicate_source(source_name: str) -> dict:
     Returns:
         {"exists": bool, "count": int, "indexed_at": str}
     """
-    import chromadb
+    # 캐시된 소스 집계(해시 조회)로 존재 여부 판단 → 없는 소스는 DB 조회 생략
+    count = get_sources_from_db(db_version()).get(source_name, {}).get("count", 0)
+    if not count:
+        return {"exists": False, "count": 0, "indexed_at": None}
 
-    try:
-        client = chromadb.PersistentClient(path=str(DB_PATH))
-        collection = client.get_collection(name="theology_library")
-        _ = collection.count() # Health check
-    except Exception:
+    _, collection = load_db(str(DB_PATH))
+    if collection is None:
         return {"exists": False, "count": 0, "indexed_at": None}
 
+    # 인덱싱 시각만 필요하므로 한 건만 조회
     results = collection.get(
         where={"source": source_name},
         include=["metadatas"],
         limit=1
     )
 
-    if not results.get("ids"):
-        return {"exists": False, "count": 0, "indexed_at": None}
-
-    # 전체 개수 조회
-    all_results = collection.get(
-        where={"source": source_name},
-        include=[]
-    )
-
     indexed_at = None
     if results.get("metadatas"):
         indexed_at = results["metadatas"][0].get("indexed_at", "")
 
     return {
         "exists": True,
-        "count": len(all_results.get("ids", [])),
+        "count": count,
         "indexed_at": indexed_at
     }
 
@@ -425,11 +775,11 @@ if title_sub:
 else:
     sub_title_html = ""
 
-# HTML 생성 (완전 인라인 문자열 결합 방식)
+# HTML 생성 (완전 인라인 문자열 결합 방식: 인접 리터럴은 컴파일 시 하나의 f-string으로 합쳐짐)
 sidebar_html = (
     '<div style="text-align: center; padding: 15px 0 25px 0;">'
     '<div style="margin-bottom: 10px;">'
-    + sub_title_html +
+    f'{sub_title_html}'
     f'<div style="font-size: 1.5em; font-weight: 900; color: #FFFFFF; letter-spacing: 0.5px; text-shadow: 0 2px 4px rgba(0,0,0,0.3);">{title_main}</div>'
     '</div>'
     '<div style="display: inline-block; background: linear-gradient(135deg, #7C3AED 0%, #6B21A8 100%); color: white; padding: 4px 16px; border-radius: 20px; font-size: 0.7em; font-weight: 700; letter-spacing: 0.5px; box-shadow: 0 2px 8px rgba(124, 58, 237, 0.4);">'
@@ -468,17 +818,12 @@ if st.sidebar.button("🟣 옵시디언 열기", use_container_width=True):
     if not vault_path_final and st.session_state.get("current_settings"):
         vault_path_final = st.session_state.current_settings.get("OBSIDIAN_VAULT", "").strip()
     
-    # 3. .env 파일 직접 읽기 (최후 수단)
-    if not vault_path_final and ENV_FILE.exists():
-        with open(ENV_FILE, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip().startswith("OBSIDIAN_VAULT="):
-                    vault_path_final = line.strip().split("=", 1)[1].strip().strip('"').strip("'")
-                    break
+    # 3. .env 파일 값 (최후 수단)
+    if not vault_path_final:
+        vault_path_final = get_env_vault_path()
     
     if vault_path_final:
         import subprocess
-        import platform
         from urllib.parse import quote
         
         # 전체 경로를 URL 인코딩하여 사용 (path= 방식)
@@ -489,9 +834,9 @@ if st.sidebar.button("🟣 옵시디언 열기", use_container_width=True):
         st.sidebar.caption(f"🚀 실행: {vault_name}")
         
         try:
-            if platform.system() == "Darwin":
+            if PLATFORM == "Darwin":
                 subprocess.run(["open", obsidian_uri])
-            elif platform.system() == "Windows":
+            elif PLATFORM == "Windows":
                 os.startfile(obsidian_uri)
             else:
                 subprocess.run(["xdg-open", obsidian_uri])
@@ -519,7 +864,260 @@ st.sidebar.markdown(
 # ============================================================
 # AI 리포트 생성 함수
 # ============================================================
-def generate_ai_report(query: str, context: str, provider: str, model_name: str, api_key: str) -> str:
+# 확장 쿼리 동시 검색 스레드 수 (get_embedding_queries의 max_q와 동일)
+SEARCH_QUERY_WORKERS = 3
+
+
+@st.cache_resource
+def get_search_executor():
+    """확장 쿼리 동시 검색용 스레드 풀 (검색마다 스레드를 새로 만들지 않음)"""
+    return ThreadPoolExecutor(max_workers=SEARCH_QUERY_WORKERS, thread_name_prefix="search")
+
+
+@st.cache_resource
+def get_semantic_search_cache():
+    """의미가 거의 같은 검색어의 이전 결과를 재사용하는 캐시 (세션 공용)"""
+    from utils.semantic_search_cache import SemanticSearchCache
+    return SemanticSearchCache()
+
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def run_search(query: str, use_trilingual: bool, use_dual_search: bool, n_results: int, db_version: tuple,
+               use_semantic_cache: bool = True) -> dict:
+    """
+    검색 실행 (쿼리/옵션/DB 버전이 같으면 캐시된 결과 재사용)
+
+    버튼 클릭으로 페이지가 다시 실행될 때 쿼리 인코딩과 DB 조회를 반복하지 않습니다.
+    표현만 조금 다른 검색어는 쿼리 임베딩 유사도로 이전 결과를 찾아 재사용하며,
+    이때 결과의 'semantic_match'에 원래 검색어를 담아 화면에 표시할 수 있게 합니다.
+    use_semantic_cache=False면 유사 검색어 결과를 쓰지 않고 새로 검색합니다.
+    """
+    # 의미 캐시 키: 결과에 영향을 주는 검색 인자 전체 (필터/결과 수/확장 옵션/DB 버전)
+    semantic_cache = get_semantic_search_cache()
+    cache_options = (use_trilingual, use_dual_search, n_results, db_version)
+    # 쿼리 임베딩은 임베더 캐시에 남아 이후 벡터 검색에서 재사용
+    query_embedding = load_embedder().embed_query(query)
+    if use_semantic_cache:
+        match = semantic_cache.lookup(query_embedding, cache_options)
+        if match is not None:
+            matched_query, cached = match
+            if matched_query == query:
+                return cached
+            return {**cached, "semantic_match": matched_query}
+
+    # 3중 언어 확장 적용
+    search_queries = [query]
+    if use_trilingual:
+        expander = load_query_expander()
+        if expander:
+            search_queries = expander.get_embedding_queries(query, max_q=3)
+    
+    # 수집하면서 바로 중복 제거 (본문 전체 기준; 앞부분만 같은 다른 청크는 유지)
+    seen_contents = set()
+    unique_results = []
+
+    def add_unique(doc):
+        content_key = doc.page_content.strip()
+        if content_key not in seen_contents:
+            seen_contents.add(content_key)
+            unique_results.append(doc)
+    
+    # 이중 검색 모드
+    if use_dual_search:
+        try:
+            dual_engine = load_dual_search_engine(
+                str(DB_PATH), str(ARCHIVE_DIR), use_trilingual
+            )
+            # 의미 캐시 조회에 쓴 임베딩을 넘겨 원 쿼리는 다시 인코딩하지 않음
+            dual_results = dual_engine.search(
+                query, n_results=n_results * 2, query_embedding=query_embedding
+            )
+            
+            # DualSearchEngine 결과를 Document 형식으로 변환
+            from langchain_core.documents import Document
+            for r in dual_results:
+                add_unique(Document(
+                    page_content=r.content,
+                    metadata={
+                        "source": r.source,
+                        "author": r.author,
+                        "doc_type": r.doc_type,
+                        "page": r.page,
+                        "search_method": r.method,
+                        **r.metadata
+                    }
+                ))
+        except Exception as e:
+            logger.warning(f"Dual search failed, falling back: {e}")
+            use_dual_search = False  # Fallback to normal search
+    
+    # 일반 벡터 검색 (fallback 또는 이중 검색 비활성화 시)
+    if not use_dual_search or not unique_results:
+        searcher = load_searcher(str(DB_PATH))
+        # 확장 쿼리를 한 번의 배치로 미리 인코딩 (이후 검색은 임베더 캐시 사용)
+        load_embedder().embed_queries(search_queries)
+        # 확장 쿼리별 검색은 서로 독립적이므로 동시에 실행 (결과 순서는 쿼리 순서 유지)
+        for results_docs in get_search_executor().map(searcher.search, search_queries):
+            for doc in results_docs:
+                add_unique(doc)
+    
+    # 기존 결과를 딕셔너리 형태로 변환 (기존 UI 호환성 유지)
+    documents = [d.page_content for d in unique_results[:n_results]]
+    metadatas = [d.metadata for d in unique_results[:n_results]]
+    results = {'documents': [documents], 'metadatas': [metadatas]}
+    semantic_cache.add(query_embedding, cache_options, query, results)
+    return results
+
+
+# AI 리포트 캐시 (SQLite, .env와 같은 위치)
+AI_REPORT_CACHE_PATH = KIT_ROOT / ".ai_report_cache.sqlite3"
+AI_REPORT_CACHE_TTL = timedelta(days=1)  # 이보다 오래된 리포트는 새로 생성
+AI_REPORT_CACHE_MAX_ENTRIES = 256  # 초과 시 오래된 것부터 삭제
+
+
+def ai_report_cache_key(model_name: str, query: str, context: str) -> str:
+    """AI 리포트 캐시 키: SHA-256(모델 + 질문 + 자료)"""
+    return hashlib.sha256(f"{model_name}\x00{query}\x00{context}".encode("utf-8")).hexdigest()
+
+
+def _open_ai_report_cache() -> sqlite3.Connection:
+    """캐시 DB 연결 (세션 스레드마다 별도 연결, 테이블 없으면 생성)"""
+    conn = sqlite3.connect(str(AI_REPORT_CACHE_PATH), timeout=5)
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS ai_report_cache (
+            hash TEXT PRIMARY KEY,
+            provider TEXT,
+            model TEXT,
+            report TEXT,
+            created_at TEXT
+        )"""
+    )
+    return conn
+
+
+def load_cached_ai_report(cache_key: str):
+    """저장된 AI 리포트 조회 (없거나 캐시 DB 오류 시 None)"""
+    try:
+        with closing(_open_ai_report_cache()) as conn:
+            cutoff = (datetime.now() - AI_REPORT_CACHE_TTL).isoformat()
+            row = conn.execute(
+                "SELECT report FROM ai_report_cache WHERE hash = ? AND created_at >= ?",
+                (cache_key, cutoff)
+            ).fetchone()
+        return row[0] if row else None
+    except sqlite3.Error as e:
+        logger.warning(f"AI report cache read failed: {e}")
+        return None
+
+
+def store_cached_ai_report(cache_key: str, provider: str, model_name: str, report: str):
+    """AI 리포트 저장 후 만료/초과 항목 정리 (캐시 실패는 리포트 생성에 영향 없음)"""
+    now = datetime.now()
+    try:
+        with closing(_open_ai_report_cache()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ai_report_cache (hash, provider, model, report, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (cache_key, provider, model_name, report, now.isoformat())
+            )
+            conn.execute(
+                "DELETE FROM ai_report_cache WHERE created_at < ?",
+                ((now - AI_REPORT_CACHE_TTL).isoformat(),)
+            )
+            conn.execute(
+                "DELETE FROM ai_report_cache WHERE hash NOT IN "
+                "(SELECT hash FROM ai_report_cache ORDER BY created_at DESC LIMIT ?)",
+                (AI_REPORT_CACHE_MAX_ENTRIES,)
+            )
+    except sqlite3.Error as e:
+        logger.warning(f"AI report cache write failed: {e}")
+
+
+@st.cache_resource(show_spinner=False)
+def get_llm_client(provider: str, api_key: str):
+    """
+    프로바이더별 SDK 클라이언트 (API 키당 한 번만 생성)
+
+    SDK 클라이언트는 내부 HTTP 연결 풀을 유지하므로, 재사용하면
+    리포트 요청마다 TCP/TLS 연결을 새로 맺지 않습니다.
+    """
+    if provider == "anthropic":
+        import anthropic
+        return anthropic.Anthropic(api_key=api_key)
+    elif provider == "openai":
+        import openai
+        return openai.OpenAI(api_key=api_key)
+    elif provider == "google":
+        from google import genai
+        return genai.Client(api_key=api_key)
+    raise ValueError(f"지원하지 않는 프로바이더: {provider}")
+
+
+# 스트리밍 리포트 화면 갱신 최소 간격 (초)
+AI_STREAM_UI_INTERVAL = 0.1
+
+
+def coalesce_stream(chunks, interval: float = AI_STREAM_UI_INTERVAL):
+    """
+    스트림 조각을 interval 동안 모아 한 번에 내보냄
+
+    st.write_stream은 조각마다 누적 텍스트 전체를 다시 렌더링하므로
+    (조각당 비용이 전체 길이에 비례) 화면 갱신 횟수 자체를 줄입니다.
+    """
+    buffer = []
+    last_flush = time.monotonic()
+    for chunk in chunks:
+        buffer.append(chunk)
+        now = time.monotonic()
+        if now - last_flush >= interval:
+            yield "".join(buffer)
+            buffer.clear()
+            last_flush = now
+    if buffer:
+        yield "".join(buffer)
+
+
+def stream_ai_report_chunks(provider: str, model_name: str, api_key: str, system_prompt: str, user_prompt: str):
+    """프로바이더 스트리밍 API를 호출하여 생성되는 텍스트 조각을 순서대로 반환"""
+    client = get_llm_client(provider, api_key)
+
+    if provider == "anthropic":
+        with client.messages.stream(
+            model=model_name,
+            max_tokens=4096,
+            system=system_prompt,
+            messages=[{"role": "user", "content": user_prompt}]
+        ) as stream:
+            yield from stream.text_stream
+
+    elif provider == "openai":
+        stream = client.chat.completions.create(
+            model=model_name,
+            max_tokens=4096,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            stream=True
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    elif provider == "google":
+        from google.genai import types
+
+        for chunk in client.models.generate_content_stream(
+            model=model_name,
+            contents=f"{system_prompt}\n\n{user_prompt}",
+            config=types.GenerateContentConfig(max_output_tokens=4096)
+        ):
+            if chunk.text:
+                yield chunk.text
+
+
+def generate_ai_report(query: str, context: str, provider: str, model_name: str, api_key: str,
+                       placeholder=None, use_cache: bool = True) -> str:
     """
     검색 결과를 바탕으로 AI가 분석 리포트 생성
 
@@ -529,6 +1127,8 @@ def generate_ai_report(query: str, context: str, provider: str, model_name: str,
         provider: API 프로바이더 (anthropic, openai, google)
         model_name: 모델 이름
         api_key: API 키
+        placeholder: 생성 중인 텍스트를 실시간으로 표시할 st.empty() (선택)
+        use_cache: False면 저장된 리포트를 무시하고 새로 생성 (결과는 다시 저장)
 
     Returns:
         AI 생성 리포트
@@ -549,75 +1149,50 @@ def generate_ai_report(query: str, context: str, provider: str, model_name: str,
 
 위 자료를 바탕으로 질문에 대한 분석 리포트를 작성해주세요."""
 
-    try:
-        if provider == "anthropic":
-            import anthropic
-            client = anthropic.Anthropic(api_key=api_key)
-            response = client.messages.create(
-                model=model_name,
-                max_tokens=4096,
-                system=system_prompt,
-                messages=[{"role": "user", "content": user_prompt}]
-            )
-            return response.content[0].text
-
-        elif provider == "openai":
-            import openai
-            client = openai.OpenAI(api_key=api_key)
-            response = client.chat.completions.create(
-                model=model_name,
-                max_tokens=4096,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ]
-            )
-            return response.choices[0].message.content
+    # 동일한 (모델, 질문, 자료) 조합은 저장된 리포트 재사용
+    cache_key = ai_report_cache_key(model_name, query, context)
+    cached = load_cached_ai_report(cache_key) if use_cache else None
+    if cached is not None:
+        return cached
 
-        elif provider == "google":
-            from google import genai
-            from google.genai import types
-            
-            client = genai.Client(api_key=api_key)
-            response = client.models.generate_content(
-                model=model_name,
-                contents=f"{system_prompt}\n\n{user_prompt}",
-                config=types.GenerateContentConfig(max_output_tokens=4096)
-            )
-            return response.text
+    if provider not in ("anthropic", "openai", "google"):
+        return f"❌ 지원하지 않는 프로바이더: {provider}"
 
+    # 스트리밍으로 받아 placeholder에 표시
+    # (st.write_stream은 갱신마다 누적 텍스트 전체를 다시 그리므로 조각을 모아 갱신 횟수를 제한)
+    try:
+        chunks = stream_ai_report_chunks(provider, model_name, api_key, system_prompt, user_prompt)
+        if placeholder is not None:
+            report = placeholder.write_stream(coalesce_stream(chunks))
         else:
-            return f"❌ 지원하지 않는 프로바이더: {provider}"
-
+            report = "".join(chunks)
     except Exception as e:
         return f"❌ AI 리포트 생성 실패: {str(e)}"
 
+    if report:
+        store_cached_ai_report(cache_key, provider, model_name, report)
+    return report
+
 
 def get_active_api_config() -> tuple:
     """현재 설정된 API 정보 반환 (provider, model, api_key)"""
-    if not ENV_FILE.exists():
+    # 캐시된 .env 파싱 결과 사용 (파일 수정 시에만 다시 읽음)
+    settings = read_env_file(file_mtime_ns(ENV_FILE))
+    if not settings:
         return None, None, None
 
-    settings = {}
-    with open(ENV_FILE, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                key, value = line.split("=", 1)
-                settings[key.strip()] = value.strip().strip('"').strip("'")
-
-    model_name = settings.get("RAG_MODEL", "")
+    model_name = settings.get("RAG_MODEL") or ""
 
     # 모델명으로 프로바이더 추론
     if model_name.startswith("claude"):
         provider = "anthropic"
-        api_key = settings.get("ANTHROPIC_API_KEY", "")
+        api_key = settings.get("ANTHROPIC_API_KEY") or ""
     elif model_name.startswith("gpt"):
         provider = "openai"
-        api_key = settings.get("OPENAI_API_KEY", "")
+        api_key = settings.get("OPENAI_API_KEY") or ""
     elif model_name.startswith("gemini"):
         provider = "google"
-        api_key = settings.get("GOOGLE_API_KEY", "")
+        api_key = settings.get("GOOGLE_API_KEY") or ""
     else:
         return None, None, None
 
@@ -627,6 +1202,112 @@ def get_active_api_config() -> tuple:
     return provider, model_name, api_key
 
 
+# 프로바이더별 API 키 설정 이름
+PROVIDER_KEY_NAMES = {
+    "anthropic": "ANTHROPIC_API_KEY",
+    "openai": "OPENAI_API_KEY",
+    "google": "GOOGLE_API_KEY",
+}
+# 프로바이더별 모델 정의
+MODELS_BY_PROVIDER = {
+    "anthropic": {
+        "Claude Opus 4.5 (최신)": "claude-opus-4-5-20251101",
+        "Claude Sonnet 4": "claude-sonnet-4-20250514",
+        "Claude Haiku 4.5 (빠름)": "claude-haiku-4-5",
+        "Claude 3.5 Sonnet": "claude-3-5-sonnet-20241022",
+    },
+    "openai": {
+        "GPT-5.2 (최신)": "gpt-5.2-2025-12-11",
+        "GPT-5.1": "gpt-5.1-2025-11-13",
+        "GPT-4.1": "gpt-4.1-2025-04-14",
+        "GPT-4.1 Mini (저렴)": "gpt-4.1-mini-2025-04-14",
+        "GPT-4o": "gpt-4o",
+    },
+    "google": {
+        "Gemini 3 Pro (최신)": "gemini-3-pro-preview",
+        "Gemini 3 Flash": "gemini-3-flash-preview",
+        "Gemini 2.5 Pro": "gemini-2.5-pro",
+        "Gemini 2.5 Flash (추천)": "gemini-2.5-flash",
+        "Gemini 2.0 Flash": "gemini-2.0-flash",
+    },
+}
+# 모델 ID → 표시 이름 (설정 페이지에서 현재 모델을 바로 찾기 위한 역색인)
+MODEL_LABELS_BY_ID = {
+    provider: {model_id: label for label, model_id in models.items()}
+    for provider, models in MODELS_BY_PROVIDER.items()
+}
+# 설정 페이지 라디오 버튼 표시 이름 → 프로바이더
+PROVIDER_BY_LABEL = {
+    "Anthropic (Claude)": "anthropic",
+    "OpenAI (GPT)": "openai",
+    "Google (Gemini)": "google",
+}
+# 비교 분석 시 RAG_MODEL로 선택되지 않은 프로바이더가 사용할 모델
+COMPARE_MODEL_BY_PROVIDER = {
+    "anthropic": "claude-haiku-4-5",
+    "openai": "gpt-4.1-mini-2025-04-14",
+    "google": "gemini-2.5-flash",
+}
+
+
+def get_configured_providers() -> list:
+    """API 키가 등록된 모든 프로바이더 [(provider, model, api_key), ...] (활성 모델이 맨 앞)"""
+    settings = read_env_file(file_mtime_ns(ENV_FILE))
+    active = get_active_api_config()
+    configs = [active] if active[0] else []
+    for provider, key_name in PROVIDER_KEY_NAMES.items():
+        api_key = settings.get(key_name) or ""
+        if api_key and provider != active[0]:
+            configs.append((provider, COMPARE_MODEL_BY_PROVIDER[provider], api_key))
+    return configs
+
+
+def generate_ai_reports_parallel(query: str, context: str, configs: list, use_cache: bool = True) -> list:
+    """
+    여러 프로바이더에 동시에 리포트를 요청 (비교 분석)
+
+    Returns:
+        [(provider, model, report), ...] (configs 순서 유지)
+    """
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+    # 작업 스레드에서도 st.cache_* 를 쓸 수 있도록 현재 실행 컨텍스트 연결
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=len(configs),
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+    ) as executor:
+        futures = [
+            executor.submit(generate_ai_report, query, context, provider, model, api_key, use_cache=use_cache)
+            for provider, model, api_key in configs
+        ]
+        return [(provider, model, f.result()) for (provider, model, _), f in zip(configs, futures)]
+
+
+# 파이프라인 출력 파이프 읽기 단위
+PIPE_READ_SIZE = 64 * 1024
+# 로그/진행률 UI 갱신 최소 간격 (초, 약 10Hz)
+PIPELINE_UI_INTERVAL = 0.1
+# "[PROGRESS] 45% | 파일명 (Page 3/10)" 형식의 진행률 줄
+PROGRESS_RE = re.compile(r"\[PROGRESS\]\s*(\d+)\s*%\s*(.*)")
+
+
+def iter_process_lines(stream):
+    """subprocess 출력 파이프를 64KB 단위로 읽어 완성된 줄만 디코딩하여 반환"""
+    fd = stream.fileno()
+    pending = b""
+    while True:
+        chunk = os.read(fd, PIPE_READ_SIZE)
+        if not chunk:
+            break
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for raw in lines:
+            yield raw.decode("utf-8", errors="replace")
+    if pending:
+        yield pending.decode("utf-8", errors="replace")
+
+
 def run_pipeline(chunk_size: int, overlap: int, target_file: str = None):
     """인덱싱 파이프라인 실행 및 실시간 로그 표시"""
     try:
@@ -643,46 +1324,56 @@ def run_pipeline(chunk_size: int, overlap: int, target_file: str = None):
         with st.status(f"🏗️ 인덱싱 파이프라인 가동 중{' (개별 파일)' if target_file else ''}...", expanded=True) as log_status:
             log_output = st.empty()
             prog_container = st.empty()
-            current_log = []
+            current_log = deque(maxlen=15)
+            log_dirty = False
+            last_log_ui = last_prog_ui = 0.0
+            last_prog_val = None
             
+            # 바이너리 파이프를 큰 단위로 직접 읽음 (줄 단위 텍스트 읽기보다 빠름)
+            # 자식 출력도 UTF-8로 고정 (한국어 Windows의 cp949 파이프 출력이 깨지지 않도록)
             process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+                env={**os.environ, "PYTHONIOENCODING": "utf-8"}
             )
             
-            for line in process.stdout:
+            for line in iter_process_lines(process.stdout):
                 line = line.strip()
                 if not line: continue
                 
-                if "[PROGRESS]" in line:
-                    try:
-                        # [v2.7.23] 개선된 진행률 파싱 (퍼센트 + 상태 메시지)
-                        parts = line.split("[PROGRESS]")[1].strip()
-                        pct_str = parts.split("%")[0].strip()
-                        prog_val = int(pct_str)
-                        # 괄호 이후 또는 % 이후의 메시지 추출
-                        if "%" in parts:
-                            status_msg = parts.split("%", 1)[1].strip()
-                        else:
-                            status_msg = ""
+                # [v2.7.23] 진행률 파싱 (퍼센트 + 상태 메시지)
+                progress_match = PROGRESS_RE.search(line)
+                if progress_match:
+                    prog_val = min(int(progress_match.group(1)), 100)
+                    status_msg = progress_match.group(2)
+                    # 퍼센트가 바뀌었거나 갱신 간격이 지난 경우에만 다시 그림
+                    now = time.monotonic()
+                    if prog_val != last_prog_val or now - last_prog_ui >= PIPELINE_UI_INTERVAL:
                         prog_container.progress(prog_val / 100, f"진행률: {prog_val}% {status_msg}")
-                    except:
-                        pass
+                        last_prog_val, last_prog_ui = prog_val, now
                 else:
                     current_log.append(line)
-                    log_output.code("\n".join(current_log[-15:]))
+                    log_dirty = True
+                    # 줄마다 다시 그리지 않고 최대 10Hz로 묶어서 갱신
+                    now = time.monotonic()
+                    if now - last_log_ui >= PIPELINE_UI_INTERVAL:
+                        log_output.code("\n".join(current_log))
+                        last_log_ui, log_dirty = now, False
                     
             process.wait()
+            if log_dirty:
+                log_output.code("\n".join(current_log))
             
             if process.returncode == 0:
                 log_status.update(label="✅ 모든 파일 처리 완료!", state="complete", expanded=False)
                 st.success("🎉 서재 업데이트가 성공적으로 완료되었습니다.")
                 load_db.clear()
+                load_dual_search_engine.clear()
                 load_lemma_index.clear()
+                get_sources_from_db.clear()
+                get_collection_count.clear()
+                list_inbox_files.clear()
                 st.session_state.page_mappings = {}
                 
                 # [v2.7.23] 완료 후 안내를 위한 세션 상태 설정 및 페이지 새로고침
@@ -695,6 +1386,184 @@ def run_pipeline(chunk_size: int, overlap: int, target_file: str = None):
     except Exception as e:
         st.error(f"❌ 시스템 오류: {e}")
 
+# ============================================================
+# 검색 결과 내보내기 (마크다운 리포트 / 옵시디언)
+# ============================================================
+# 파일명에 쓸 수 없는 문자 (문자/숫자/._- 공백 이외)
+UNSAFE_FILENAME_RE = re.compile(r"[^\w.\- ]")
+# 표시용 쪽수 보정값 (메타데이터 쪽수 + PAGE_OFFSET)
+PAGE_OFFSET = 0
+# AI 분석에 보낼 참고 자료 최대 길이 (문자 수, 약 6k 토큰)
+MAX_CTX_CHARS = 24000
+
+
+def format_page_number(meta: dict):
+    """메타데이터의 쪽수 (page 또는 page_number)를 표시용으로 변환"""
+    raw_page = meta.get('page', meta.get('page_number', '?'))
+    return int(raw_page) + PAGE_OFFSET if str(raw_page).isdigit() else raw_page
+
+
+class SearchHit(NamedTuple):
+    """화면/리포트/AI 자료에 공통으로 쓰는 검색 결과 한 건"""
+    content: str
+    source: str
+    page_num: object
+    lemma: str
+    category: str
+    author: str
+    meta: dict
+
+
+def extract_search_hits(results: dict) -> list:
+    """run_search 결과에서 표시용 필드를 한 번만 추출"""
+    return [
+        SearchHit(
+            content=doc,
+            source=meta.get('source', 'Unknown'),
+            page_num=format_page_number(meta),
+            lemma=meta.get('lemma', ''),
+            category=meta.get('category', ''),
+            author=meta.get('author', ''),
+            meta=meta,
+        )
+        for doc, meta in zip(results['documents'][0], results['metadatas'][0])
+    ]
+
+
+def build_ai_context(hits: list) -> str:
+    """
+    검색 결과를 AI 분석용 참고 자료 텍스트로 변환
+
+    본문 합계가 MAX_CTX_CHARS를 넘으면 각 자료를 길이에 비례해 잘라
+    요청 크기와 프롬프트 처리 시간을 제한합니다.
+    """
+    docs = [hit.content for hit in hits]
+
+    total_chars = sum(len(d) for d in docs)
+    if total_chars > MAX_CTX_CHARS:
+        ratio = MAX_CTX_CHARS / total_chars
+        docs = [d[:int(len(d) * ratio)] + " …" for d in docs]
+
+    return "\n\n---\n\n".join(
+        f"[출처: {hit.source}, p.{hit.page_num}]\n{doc}"
+        for doc, hit in zip(docs, hits)
+    )
+
+
+def generate_search_report(query: str, hits: list) -> str:
+    """검색 결과를 마크다운 리포트로 변환"""
+    report_parts = [
+        f"# 검색 리포트: {query}\n\n"
+        f"**검색일**: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
+        f"**결과 수**: {len(hits)}건\n\n"
+        "---\n\n"
+    ]
+
+    # 결과 하나당 블록 하나를 만들어 마지막에 한 번만 이어붙임
+    for i, hit in enumerate(hits):
+        report_parts.append(
+            f"## [{i+1}] {hit.source} - p.{hit.page_num}\n"
+            + (f"**표제어**: {hit.lemma}\n" if hit.lemma else "")
+            + (f"**분류**: {hit.category}\n" if hit.category else "")
+            + f"\n{hit.content}\n\n---\n\n"
+        )
+
+    report_parts.append(f"*Generated by {APP_TITLE}*")
+    return "".join(report_parts)
+
+
+def save_to_obsidian(content: str, filename: str) -> tuple:
+    """옵시디언 Vault에 마크다운 파일 저장"""
+    # 경로 확인 (사이드바 버튼과 동일한 방식)
+    vault_path_str = ""
+    
+    # 1. 세션 스테이트 (설정 페이지에서 입력 중인 값)
+    if st.session_state.get("obsidian_vault_input"):
+        vault_path_str = st.session_state.get("obsidian_vault_input", "").strip()
+    
+    # 2. 세션 스테이트의 저장된 설정
+    if not vault_path_str and st.session_state.get("current_settings"):
+        vault_path_str = st.session_state.current_settings.get("OBSIDIAN_VAULT", "").strip()
+    
+    # 3. .env 파일 값
+    if not vault_path_str:
+        vault_path_str = get_env_vault_path()
+    
+    if not vault_path_str:
+        return False, "Obsidian Vault 경로가 설정되지 않았습니다."
+
+    vault_path = Path(vault_path_str)
+    # 같은 Vault는 세션당 한 번만 존재 여부 확인
+    if st.session_state.get("_obsidian_vault_checked") != vault_path_str:
+        if not vault_path.exists():
+            return False, f"Vault 경로가 존재하지 않습니다: {vault_path}"
+        st.session_state["_obsidian_vault_checked"] = vault_path_str
+
+    # 파일명 정리 (특수문자 제거)
+    safe_filename = UNSAFE_FILENAME_RE.sub("_", filename)
+    file_path = vault_path / f"{safe_filename}.md"
+
+    try:
+        # 바이트로 기록 후 교체 (Windows에서도 줄바꿈을 \r\n으로 바꾸지 않고,
+        # 중단되어도 Vault에 반쯤 쓰인 노트가 남지 않음)
+        atomic_write_bytes(file_path, content.encode("utf-8"))
+        return True, str(file_path)
+    except Exception as e:
+        st.session_state.pop("_obsidian_vault_checked", None)
+        return False, str(e)
+
+
+VAULT_HISTORY_FILE = SCRIPT_DIR / "vault_history.json"
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_vault_history(history_path: str) -> list:
+    """최근 사용한 Obsidian Vault 경로 목록 (저장 시 캐시 무효화)"""
+    try:
+        with open(history_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []
+
+
+def save_vault_history(vault_path: str):
+    """Vault 경로를 이력 맨 앞에 추가 (이미 맨 앞이면 기록 생략)"""
+    history = load_vault_history(str(VAULT_HISTORY_FILE))
+    if history[:1] == [vault_path]:
+        return
+    if vault_path in history:
+        history.remove(vault_path)
+    history.insert(0, vault_path)
+    history = history[:5]  # 최근 5개만 유지
+    atomic_write_text(VAULT_HISTORY_FILE, json.dumps(history, ensure_ascii=False, indent=2))
+    load_vault_history.clear()
+
+
+GUI_GUIDE_PATH = KIT_ROOT / "docs" / "GUI_GUIDE.md"
+
+
+@st.cache_data(show_spinner=False)
+def read_text_file(path: str, mtime_ns: int):
+    """텍스트 파일 내용 (수정 시각이 바뀔 때만 다시 읽음, 파일이 없으면 None)"""
+    if not mtime_ns:
+        return None
+    return Path(path).read_text(encoding="utf-8")
+
+
+def set_session_value(key: str, value):
+    """버튼 on_click 콜백: 세션 값 설정 (다음 실행에 바로 반영)"""
+    st.session_state[key] = value
+
+
+def reset_session_key(key: str):
+    """
+    버튼 on_click 콜백: 세션 상태 값을 None으로 되돌림
+
+    콜백은 스크립트 재실행 전에 처리되므로 별도의 st.rerun()이 필요 없습니다.
+    """
+    st.session_state[key] = None
+
+
 # ============================================================
 # 검색 페이지
 # ============================================================
@@ -750,153 +1619,36 @@ if page == "🔍 검색":
 
         if query:
             with st.spinner("검색 중..."):
-                # 3중 언어 확장 적용
-                search_queries = [query]
-                if use_trilingual:
-                    expander = load_query_expander()
-                    if expander:
-                        search_queries = expander.get_embedding_queries(query, max_q=3)
-                
-                all_results = []
-                
-                # 이중 검색 모드
-                if use_dual_search:
-                    try:
-                        from utils.dual_search import DualSearchEngine
-                        dual_engine = DualSearchEngine(
-                            db_path=str(DB_PATH),
-                            archive_path=str(ARCHIVE_DIR),
-                            use_trilingual=use_trilingual
-                        )
-                        dual_results = dual_engine.search(query, n_results=n_results * 2)
-                        
-                        # DualSearchEngine 결과를 Document 형식으로 변환
-                        from langchain_core.documents import Document
-                        for r in dual_results:
-                            doc = Document(
-                                page_content=r.content,
-                                metadata={
-                                    "source": r.source,
-                                    "author": r.author,
-                                    "doc_type": r.doc_type,
-                                    "page": r.page,
-                                    "search_method": r.method,
-                                    **r.metadata
-                                }
-                            )
-                            all_results.append(doc)
-                    except Exception as e:
-                        logger.warning(f"Dual search failed, falling back: {e}")
-                        use_dual_search = False  # Fallback to normal search
-                
-                # 일반 벡터 검색 (fallback 또는 이중 검색 비활성화 시)
-                if not use_dual_search or not all_results:
-                    searcher = load_searcher(str(DB_PATH))
-                    for sq in search_queries:
-                        results_docs = searcher.search(sq)
-                        all_results.extend(results_docs)
-                
-                # 중복 제거 (content 기준)
-                seen_contents = set()
-                unique_results = []
-                for doc in all_results:
-                    content_key = doc.page_content[:100]
-                    if content_key not in seen_contents:
-                        seen_contents.add(content_key)
-                        unique_results.append(doc)
-                
-                # 기존 결과를 딕셔너리 형태로 변환 (기존 UI 호환성 유지)
-                documents = [d.page_content for d in unique_results[:n_results]]
-                metadatas = [d.metadata for d in unique_results[:n_results]]
-                results = {'documents': [documents], 'metadatas': [metadatas]}
-
-            if results['documents'] and results['documents'][0]:
-                st.markdown(f"### 검색 결과 ({len(results['documents'][0])}건)")
-
-                # ─────────────────────────────────────────────────────────
-                # 마크다운 리포트 생성 함수
-                # ─────────────────────────────────────────────────────────
-                def generate_search_report(query: str, results: dict) -> str:
-                    """검색 결과를 마크다운 리포트로 변환"""
-                    report_lines = [
-                        f"# 검색 리포트: {query}",
-                        f"",
-                        f"**검색일**: {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-                        f"**결과 수**: {len(results['documents'][0])}건",
-                        f"",
-                        "---",
-                        "",
-                    ]
-
-                    for i, doc in enumerate(results['documents'][0]):
-                        meta = results['metadatas'][0][i]
-                        source = meta.get('source', 'Unknown')
-                        # 메타데이터 키 호환성 처리 (page or page_number)
-                        raw_page = meta.get('page', meta.get('page_number', '?'))
-                        try:
-                            page_num = int(raw_page) + PAGE_OFFSET if str(raw_page).isdigit() else raw_page
-                        except:
-                            page_num = raw_page
-                        
-                        lemma = meta.get('lemma', '')
-                        category = meta.get('category', '')
-
-                        report_lines.append(f"## [{i+1}] {source} - p.{page_num}")
-                        if lemma:
-                            report_lines.append(f"**표제어**: {lemma}")
-                        if category:
-                            report_lines.append(f"**분류**: {category}")
-                        report_lines.append("")
-                        report_lines.append(doc)
-                        report_lines.append("")
-                        report_lines.append("---")
-                        report_lines.append("")
-
-                    report_lines.append(f"*Generated by {APP_TITLE}*")
-                    return "\n".join(report_lines)
-
-                # 리포트 생성
-                markdown_report = generate_search_report(query, results)
+                # "새로 검색"을 누른 검색어는 유사 검색어 결과를 재사용하지 않음
+                use_semantic_cache = st.session_state.get("semantic_bypass_query") != query
+                results = run_search(
+                    query, use_trilingual, use_dual_search, n_results, db_version(),
+                    use_semantic_cache=use_semantic_cache
+                )
+
+            if results.get("semantic_match"):
+                col_sem_info, col_sem_btn = st.columns([4, 1])
+                with col_sem_info:
+                    st.info(f"♻️ 유사한 검색어 **'{results['semantic_match']}'**의 결과를 재사용했습니다.")
+                with col_sem_btn:
+                    st.button(
+                        "🔄 새로 검색", key="semantic_bypass_btn",
+                        on_click=set_session_value, args=("semantic_bypass_query", query),
+                        help="이 검색어로 DB를 다시 검색합니다"
+                    )
 
-                # 옵시디언으로 내보내기 함수
-                def save_to_obsidian(content: str, filename: str) -> tuple:
-                    """옵시디언 Vault에 마크다운 파일 저장"""
-                    # 경로 확인 (사이드바 버튼과 동일한 방식)
-                    vault_path_str = ""
-                    
-                    # 1. 세션 스테이트 (설정 페이지에서 입력 중인 값)
-                    if st.session_state.get("obsidian_vault_input"):
-                        vault_path_str = st.session_state.get("obsidian_vault_input", "").strip()
-                    
-                    # 2. 세션 스테이트의 저장된 설정
-                    if not vault_path_str and st.session_state.get("current_settings"):
-                        vault_path_str = st.session_state.current_settings.get("OBSIDIAN_VAULT", "").strip()
-                    
-                    # 3. .env 파일 직접 읽기
-                    if not vault_path_str and ENV_FILE.exists():
-                        with open(ENV_FILE, "r", encoding="utf-8") as f:
-                            for line in f:
-                                if line.strip().startswith("OBSIDIAN_VAULT="):
-                                    vault_path_str = line.strip().split("=", 1)[1].strip().strip('"').strip("'")
-                                    break
-                    
-                    if not vault_path_str:
-                        return False, "Obsidian Vault 경로가 설정되지 않았습니다."
+            # 결과별 출처/쪽수 등은 한 번만 추출하여 리포트/AI 자료/화면 표시에 공통 사용
+            hits = extract_search_hits(results) if results['documents'] else []
 
-                    vault_path = Path(vault_path_str)
-                    if not vault_path.exists():
-                        return False, f"Vault 경로가 존재하지 않습니다: {vault_path}"
+            if hits:
+                st.markdown(f"### 검색 결과 ({len(hits)}건)")
 
-                    # 파일명 정리 (특수문자 제거)
-                    safe_filename = "".join(c if c.isalnum() or c in "._- " else "_" for c in filename)
-                    file_path = vault_path / f"{safe_filename}.md"
+                # 리포트 생성
+                markdown_report = generate_search_report(query, hits)
 
-                    try:
-                        with open(file_path, "w", encoding="utf-8") as f:
-                            f.write(content)
-                        return True, str(file_path)
-                    except Exception as e:
-                        return False, str(e)
+                # API 설정 확인 (렌더링당 한 번만 조회하여 버튼/리포트 생성에 공통 사용)
+                provider, model_name, api_key = get_active_api_config()
+                ai_configs = get_configured_providers()
 
                 # 다운로드/옵시디언/AI 리포트 버튼
                 export_col1, export_col2, export_col3 = st.columns([1, 1, 1])
@@ -917,11 +1669,20 @@ if page == "🔍 검색":
                         else:
                             st.error(f"❌ {result}")
                 with export_col3:
-                    # API 설정 확인
-                    provider, model_name, api_key = get_active_api_config()
                     if provider and api_key:
                         if st.button("🤖 AI 분석", key="ai_report"):
                             st.session_state["generate_ai_report"] = True
+                        if len(ai_configs) > 1:
+                            st.checkbox(
+                                f"🔀 {len(ai_configs)}개 AI 동시 비교",
+                                key="ai_compare",
+                                help="API 키가 등록된 모든 프로바이더에 동시에 요청하여 결과를 나란히 보여줍니다"
+                            )
+                        st.checkbox(
+                            "♻️ 캐시 무시",
+                            key="ai_bypass_cache",
+                            help="같은 질문·자료로 만든 리포트가 저장되어 있어도 새로 생성합니다"
+                        )
                     else:
                         if st.button("🤖 AI 분석", key="ai_report_disabled", disabled=True):
                             pass
@@ -929,25 +1690,26 @@ if page == "🔍 검색":
 
                 # AI 리포트 생성
                 if st.session_state.get("generate_ai_report"):
-                    provider, model_name, api_key = get_active_api_config()
                     if provider and api_key:
-                        with st.spinner(f"🤖 AI 분석 중... ({model_name})"):
-                            # 검색 결과를 컨텍스트로 변환
-                            context_parts = []
-                            for i, doc in enumerate(results['documents'][0]):
-                                meta = results['metadatas'][0][i]
-                                source = meta.get('source', 'Unknown')
-                                raw_page = meta.get('page', meta.get('page_number', '?'))
-                                try:
-                                    page_num = int(raw_page) + PAGE_OFFSET if str(raw_page).isdigit() else raw_page
-                                except:
-                                    page_num = raw_page
-                                context_parts.append(f"[출처: {source}, p.{page_num}]\n{doc}")
-
-                            context = "\n\n---\n\n".join(context_parts)
-
-                            # AI 리포트 생성
-                            ai_report = generate_ai_report(query, context, provider, model_name, api_key)
+                        # 검색 결과를 컨텍스트로 변환 (길이 제한 적용)
+                        context = build_ai_context(hits)
+                        use_cache = not st.session_state.get("ai_bypass_cache")
+
+                        if st.session_state.get("ai_compare") and len(ai_configs) > 1:
+                            # 여러 프로바이더 동시 요청 후 결과를 이어서 표시
+                            with st.spinner(f"🤖 {len(ai_configs)}개 AI 동시 분석 중..."):
+                                reports = generate_ai_reports_parallel(query, context, ai_configs, use_cache=use_cache)
+                            ai_report = "\n\n---\n\n".join(
+                                f"## 🤖 {p_name} ({p_model})\n\n{p_report}"
+                                for p_name, p_model, p_report in reports
+                            )
+                        else:
+                            with st.spinner(f"🤖 AI 분석 중... ({model_name})"):
+                                # AI 리포트 생성 (스트리밍 출력)
+                                ai_report = generate_ai_report(
+                                    query, context, provider, model_name, api_key,
+                                    placeholder=st.empty(), use_cache=use_cache
+                                )
 
                         st.session_state["ai_report_content"] = ai_report
                         st.session_state["generate_ai_report"] = False
@@ -979,46 +1741,28 @@ if page == "🔍 검색":
                             else:
                                 st.error(f"❌ {result}")
                     with ai_col3:
-                        if st.button("🗑️ 닫기", key="close_ai_report"):
-                            st.session_state["ai_report_content"] = None
-                            st.rerun()
+                        st.button("🗑️ 닫기", key="close_ai_report",
+                                  on_click=reset_session_key, args=("ai_report_content",))
 
                     st.markdown("---")
 
                 st.markdown("---")
 
-                # 개별 결과 표시
-                for i, doc in enumerate(results['documents'][0]):
-                    meta = results['metadatas'][0][i]
-
-                    # 출처 정보
-                    source = meta.get('source', 'Unknown')
-                    raw_page = meta.get('page', meta.get('page_number', '?'))
-                    page_num = raw_page
-                    
-                    lemma = meta.get('lemma', '')
-                    category = meta.get('category', '')
-                    author = meta.get('author', '')
-
-                    # 하이라이팅 처리 (단순 텍스트 교체)
-                    highlighted_doc = doc
-                    if query:
-                        # 한국어/영어/독일어 키워드 강조
-                        keywords = query.split()
-                        for kw in keywords:
-                            if len(kw) > 1:
-                                pattern = re.compile(re.escape(kw), re.IGNORECASE)
-                                highlighted_doc = pattern.sub(f"<mark style='background-color: #FEF08A; border-radius: 2px; padding: 0 2px;'>{kw}</mark>", highlighted_doc)
+                # 개별 결과 표시 (한국어/영어/독일어 키워드 강조 패턴은 쿼리당 1회 컴파일)
+                highlight_pattern = get_highlight_pattern(query) if query else None
+                for i, hit in enumerate(hits):
+                    # 하이라이팅 처리
+                    highlighted_doc = highlight_keywords(hit.content, highlight_pattern)
 
                     # 카드 형식으로 표시
-                    with st.expander(f"**[{i+1}] {source}** - p.{page_num} {f'| {lemma}' if lemma else ''}", expanded=(i==0)):
-                        if category or author:
-                            st.caption(f"📂 {category} {'| ✍️ ' + author if author else ''}")
+                    with st.expander(f"**[{i+1}] {hit.source}** - p.{hit.page_num} {f'| {hit.lemma}' if hit.lemma else ''}", expanded=(i==0)):
+                        if hit.category or hit.author:
+                            st.caption(f"📂 {hit.category} {'| ✍️ ' + hit.author if hit.author else ''}")
                         st.markdown(highlighted_doc, unsafe_allow_html=True)
                         
                         # 추가 메타데이터 정보 (고급 사용자용)
                         if st.checkbox(f"메타데이터 보기 ##{i}", key=f"meta_{i}"):
-                            st.json(meta)
+                            st.json(hit.meta)
             else:
                 st.info("검색 결과가 없습니다.")
 
@@ -1037,10 +1781,7 @@ elif page == "📁 Inbox":
     """, unsafe_allow_html=True)
 
     # Inbox 파일 목록 가져오기
-    inbox_files = []
-    if INBOX_DIR.exists():
-        for ext in ["*.pdf", "*.epub", "*.txt"]:
-            inbox_files.extend(list(INBOX_DIR.rglob(ext)))
+    inbox_files = list_inbox_files(str(INBOX_DIR)) if INBOX_DIR.exists() else []
     
     if not inbox_files:
         st.info("📂 Inbox가 비어있습니다. Finder에 파일을 넣어주세요.")
@@ -1053,7 +1794,7 @@ elif page == "📁 Inbox":
             st.caption("PDF의 실제 페이지가 맞지 않거나, 정확한 저자/연도를 지정하려면 여기서 JSON을 생성하세요.")
             
             # File Selector
-            target = st.selectbox("편집할 파일 선택", inbox_files, format_func=lambda x: x.name, key="meta_target")
+            target = st.selectbox("편집할 파일 선택", [f for f, _, _ in inbox_files], format_func=lambda x: x.name, key="meta_target")
             
             if target:
                 # 기본 파싱
@@ -1069,7 +1810,6 @@ elif page == "📁 Inbox":
                 existing_data = {}
                 if sidecar_path.exists():
                     try:
-                        import json
                         with open(sidecar_path, "r", encoding="utf-8") as f:
                             existing_data = json.load(f)
                         st.success(f"✅ 기존 설정이 로드되었습니다: `{sidecar_path.name}`")
@@ -1103,11 +1843,11 @@ elif page == "📁 Inbox":
                         }
                         save_path = target.with_suffix(target.suffix + ".json")
                         try:
-                            import json
                             with open(save_path, "w", encoding="utf-8") as f:
                                 json.dump(meta_data, f, ensure_ascii=False, indent=2)
                             st.balloons()
                             st.success(f"저장 완료! 이제 Colab에서 이 설정을 사용합니다.\n경로: `{save_path.name}`")
+                            list_inbox_files.clear()
                             st.rerun()
                         except Exception as e:
                             st.error(f"저장 실패: {e}")
@@ -1119,25 +1859,23 @@ elif page == "📁 Inbox":
     st.divider()
     st.subheader(f"📂 파일 목록 ({len(inbox_files)})")
     
-    for f in inbox_files:
+    for f, size, sc in inbox_files:
         col_f1, col_f2, col_f3 = st.columns([0.6, 0.2, 0.2])
         with col_f1:
             st.write(f"📄 **{f.name}**")
-            # Sidecar Check
-            sc = f.with_suffix(f.suffix + ".json")
-            if not sc.exists(): sc = f.with_suffix(".json")
-            
-            if sc.exists():
+            # Sidecar (목록 조회 시 함께 확인됨)
+            if sc:
                 st.caption(f"└─ ⚙️ {sc.name}")
         
         with col_f2:
-            st.caption(f"{f.stat().st_size / (1024*1024):.1f} MB")
+            st.caption(f"{size / (1024*1024):.1f} MB")
             
         with col_f3:
             if st.button("🗑️ 삭제", key=f"del_{f.name}"):
                 try:
                     f.unlink()
-                    if sc.exists(): sc.unlink() # Sidecar도 삭제
+                    if sc and sc.exists(): sc.unlink() # Sidecar도 삭제
+                    list_inbox_files.clear()
                     st.rerun()
                 except Exception as e:
                     st.error(f"Error: {e}")
@@ -1154,14 +1892,15 @@ elif page == "📊 통계":
     """, unsafe_allow_html=True)
     
     client, collection = load_db(str(DB_PATH))
-    index_data = load_lemma_index(str(LEMMA_INDEX_PATH))
+    index_data = load_lemma_index(str(LEMMA_INDEX_PATH), file_mtime_ns(LEMMA_INDEX_PATH))
+    current_db_version = db_version()
 
     col1, col2, col3 = st.columns(3)
 
     with col1:
         st.metric(
             "📄 인덱싱된 청크",
-            f"{collection.count():,}개" if collection else "0개"
+            f"{get_collection_count(current_db_version):,}개" if collection else "0개"
         )
 
     with col2:
@@ -1170,75 +1909,24 @@ elif page == "📊 통계":
 
     with col3:
         # 보관된 청킹 JSON 문서 수 (인덱싱 완료된 도서)
-        archive_files = []
-        if ARCHIVE_DIR.exists():
-            archive_files = [f for f in ARCHIVE_DIR.glob("*.json") if not f.name.startswith("lemma_")]
+        archive_files = list_archive_files(str(ARCHIVE_DIR), file_mtime_ns(ARCHIVE_DIR))
         st.metric("📚 보관 문서", f"{len(archive_files)}권")
 
     st.markdown("---")
 
-    # 소스별 분포 (ChromaDB에서 직접 조회)
-    by_source = get_sources_from_db()
+    # 소스별 분포 (ChromaDB에서 직접 조회, DB 변경 시에만 재집계)
+    by_source = get_sources_from_db(current_db_version)
 
     if by_source:
-        import pandas as pd
-
         total_chunks = sum(info.get("count", 0) for info in by_source.values())
 
         st.markdown(f"### 📚 인덱싱 소스 ({len(by_source)}개, 총 {total_chunks:,} 청크)")
 
-        # 소스 유형 분류 (자동 추론)
-        SOURCE_TYPES = {
-            "TRE": "신학백과", "RGG": "신학백과", "EKL": "신학백과",
-            "TDNT": "성서사전", "NIDNTT": "성서사전", "EDNT": "성서사전",
-            "ThWAT": "성서사전", "EWNT": "성서사전",
-            "HWPh": "철학사전",
-            "KD": "교의학",
-        }
+        # 데이터 준비 (DB 변경 시에만 다시 구성)
+        df = build_source_table(current_db_version)
 
-        # 데이터 준비
-        source_data = []
-        for source, info in by_source.items():
-            volumes = info.get("volumes", [])
-            source_data.append({
-                "소스": source,
-                "유형": SOURCE_TYPES.get(source, "기타"),
-                "권수": len(volumes) if volumes else 1,
-                "청크": info.get("count", 0),
-            })
-
-        df = pd.DataFrame(source_data).sort_values("청크", ascending=False)
-
-        # 필터 UI
-        col1, col2 = st.columns([2, 1])
-        with col1:
-            search_source = st.text_input("소스 검색", placeholder="예: TRE, RGG...", key="source_search")
-        with col2:
-            all_types = ["전체"] + sorted(df["유형"].unique().tolist())
-            selected_type = st.selectbox("유형 필터", all_types, key="type_filter")
-
-        # 필터 적용
-        filtered_df = df.copy()
-        if search_source:
-            filtered_df = filtered_df[filtered_df["소스"].str.contains(search_source, case=False)]
-        if selected_type != "전체":
-            filtered_df = filtered_df[filtered_df["유형"] == selected_type]
-
-        # 테이블 표시 (상위 10개 + 더보기)
-        show_all = st.checkbox(f"전체 표시 ({len(filtered_df)}개)", key="show_all_sources")
-        display_df = filtered_df if show_all else filtered_df.head(10)
-
-        st.dataframe(
-            display_df,
-            column_config={
-                "소스": st.column_config.TextColumn("소스", width="medium"),
-                "유형": st.column_config.TextColumn("유형", width="small"),
-                "권수": st.column_config.NumberColumn("권수", format="%d"),
-                "청크": st.column_config.NumberColumn("청크", format="%d"),
-            },
-            hide_index=True,
-            width="stretch"
-        )
+        # 필터 UI + 테이블 (fragment: 필터 조작 시 이 영역만 다시 실행)
+        render_source_table(df)
 
         # 차트 (상위 10개만)
         if len(df) > 0:
@@ -1268,9 +1956,10 @@ elif page == "📊 통계":
 
             with col_info:
                 st.info(f"**{selected_source}**: {chunk_count:,}개 청크")
-                # 아카이브 파일 존재 여부 확인
+                # 아카이브 파일 존재 여부 확인 (캐시된 아카이브 목록 사용)
                 archive_file = ARCHIVE_DIR / f"{selected_source}.json"
-                if archive_file.exists():
+                has_archive = archive_file.name in archive_files
+                if has_archive:
                     st.success(f"📦 아카이브 파일 존재: {archive_file.name}")
                 else:
                     st.warning("⚠️ 아카이브 파일 없음 (재인덱싱 불가)")
@@ -1283,7 +1972,7 @@ elif page == "📊 통계":
                     st.session_state["confirm_delete"] = selected_source
 
                 # 재인덱싱 버튼 (아카이브 파일 있을 때만)
-                if archive_file.exists():
+                if has_archive:
                     if st.button("🔄 재인덱싱", key=f"reindex_{selected_source}", type="primary"):
                         st.session_state["confirm_reindex"] = selected_source
 
@@ -1302,9 +1991,8 @@ elif page == "📊 통계":
                             except Exception as e:
                                 st.error(f"삭제 실패: {e}")
                 with col_no:
-                    if st.button("❌ 취소", key="confirm_delete_no"):
-                        st.session_state["confirm_delete"] = None
-                        st.rerun()
+                    st.button("❌ 취소", key="confirm_delete_no",
+                              on_click=reset_session_key, args=("confirm_delete",))
 
             # 재인덱싱 확인 다이얼로그
             if st.session_state.get("confirm_reindex") == selected_source:
@@ -1321,9 +2009,8 @@ elif page == "📊 통계":
                             except Exception as e:
                                 st.error(f"재인덱싱 실패: {e}")
                 with col_no:
-                    if st.button("❌ 취소", key="confirm_reindex_no"):
-                        st.session_state["confirm_reindex"] = None
-                        st.rerun()
+                    st.button("❌ 취소", key="confirm_reindex_no",
+                              on_click=reset_session_key, args=("confirm_reindex",))
 
     else:
         st.info("소스 정보가 없습니다.")
@@ -1348,40 +2035,32 @@ elif page == "⚙️ 설정":
         </div>
     """, unsafe_allow_html=True)
 
-    # .env 파일 경로
-    ENV_FILE = KIT_ROOT / ".env"
-
     # 현재 설정 로드 (전역 설정 기반)
     def load_env_settings():
         return load_global_settings()
 
     def save_env_settings(settings_to_save: dict):
-        """설정을 .env 파일에 저장"""
-        # 기존 내용 읽기
-        existing_lines = []
-        existing_keys = set()
-        if ENV_FILE.exists():
-            with open(ENV_FILE, "r", encoding="utf-8") as f:
-                for line in f:
-                    stripped = line.strip()
-                    if stripped and not stripped.startswith("#") and "=" in stripped:
-                        key = stripped.split("=", 1)[0].strip()
-                        if key in settings_to_save:
-                            existing_keys.add(key)
-                            existing_lines.append(f"{key}={settings_to_save[key]}\n")
-                        else:
-                            existing_lines.append(line)
-                    else:
-                        existing_lines.append(line)
-
-        # 새 키 추가
-        for key, value in settings_to_save.items():
-            if key not in existing_keys:
-                existing_lines.append(f"{key}={value}\n")
+        """설정을 .env 파일에 저장 (주석/순서 유지, 한 번 읽고 한 번 기록)"""
+        text = ENV_FILE.read_text(encoding="utf-8") if ENV_FILE.exists() else ""
+        if text and not text.endswith("\n"):
+            text += "\n"
 
-        # 저장
-        with open(ENV_FILE, "w", encoding="utf-8") as f:
-            f.writelines(existing_lines)
+        # 기존 키는 해당 줄만 교체
+        lines = text.splitlines(keepends=True)
+        existing_keys = set()
+        for i, line in enumerate(lines):
+            stripped = line.strip()
+            if stripped and not stripped.startswith("#") and "=" in stripped:
+                key = stripped.split("=", 1)[0].strip()
+                if key in settings_to_save:
+                    existing_keys.add(key)
+                    lines[i] = f"{key}={settings_to_save[key]}\n"
+
+        # 새 키 추가 후 한 번에 저장
+        lines.extend(
+            f"{key}={value}\n" for key, value in settings_to_save.items() if key not in existing_keys
+        )
+        atomic_write_text(ENV_FILE, "".join(lines))
 
     # 세션 상태 활용하여 입력값 유지
     if "settings_loaded" not in st.session_state:
@@ -1389,6 +2068,7 @@ elif page == "⚙️ 설정":
         st.session_state.settings_loaded = True
 
     settings = st.session_state.current_settings
+    saved_vault = settings.get("OBSIDIAN_VAULT", "")
 
     # ─────────────────────────────────────────────────────────
     # 앱 타이틀 설정
@@ -1411,27 +2091,7 @@ elif page == "⚙️ 설정":
     st.markdown("### 📝 Obsidian 연동 설정")
     st.caption("검색 결과를 Obsidian 노트로 저장할 수 있습니다.")
 
-    VAULT_HISTORY_FILE = SCRIPT_DIR / "vault_history.json"
-    
-    def load_vault_history():
-        if VAULT_HISTORY_FILE.exists():
-            try:
-                with open(VAULT_HISTORY_FILE, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except:
-                return []
-        return []
-
-    def save_vault_history(vault_path):
-        history = load_vault_history()
-        if vault_path in history:
-            history.remove(vault_path)
-        history.insert(0, vault_path)
-        history = history[:5]  # 최근 5개만 유지
-        with open(VAULT_HISTORY_FILE, "w", encoding="utf-8") as f:
-            json.dump(history, f, ensure_ascii=False, indent=2)
-
-    vault_history = load_vault_history()
+    vault_history = load_vault_history(str(VAULT_HISTORY_FILE))
     
     # 1. 최근 사용된 볼트 선택
     selected_vault_from_history = ""
@@ -1446,7 +2106,7 @@ elif page == "⚙️ 설정":
     if selected_vault_from_history != "-- 직접 입력 --":
         default_vault = selected_vault_from_history
     else:
-        default_vault = settings.get("OBSIDIAN_VAULT", "")
+        default_vault = saved_vault
     
     obsidian_vault_input = st.text_input(
         "Obsidian Vault 경로",
@@ -1456,16 +2116,16 @@ elif page == "⚙️ 설정":
         help="Obsidian Vault의 전체 경로를 입력하세요"
     )
 
+    # 경로 존재 확인 (입력할 때마다 재실행되므로 짧은 TTL 캐시 사용)
+    vault_exists = bool(obsidian_vault_input) and path_exists(obsidian_vault_input)
+
     # 경로가 변경/입력되면 이력에 추가
-    if obsidian_vault_input and obsidian_vault_input != settings.get("OBSIDIAN_VAULT", ""):
-        vault_path = Path(obsidian_vault_input)
-        if vault_path.exists():
-            save_vault_history(obsidian_vault_input)
+    if vault_exists and obsidian_vault_input != saved_vault:
+        save_vault_history(obsidian_vault_input)
 
-    # 경로 존재 확인
     if obsidian_vault_input:
         vault_path = Path(obsidian_vault_input)
-        if vault_path.exists():
+        if vault_exists:
             st.success(f"✅ Vault 확인됨: {vault_path.name}")
         else:
             st.warning("⚠️ 경로가 존재하지 않습니다")
@@ -1483,8 +2143,6 @@ elif page == "⚙️ 설정":
     with col_reset1:
         if st.button("🧨 DB 초기화 (Reset)", type="primary", use_container_width=True):
             try:
-                import shutil
-                
                 # 1. ChromaDB 삭제 (아카이브는 보존)
                 if DB_PATH.exists():
                     shutil.rmtree(DB_PATH)
@@ -1513,7 +2171,7 @@ elif page == "⚙️ 설정":
     st.caption("구글 드라이브가 설치된 경로를 연결해야 정상 작동합니다.")
 
     # 현재 설정된 경로가 유효한지 확인
-    is_path_valid = INBOX_DIR.exists() and DB_PATH.exists()
+    is_path_valid = path_exists(str(INBOX_DIR)) and path_exists(str(DB_PATH))
     
     if is_path_valid:
         st.success(f"✅ 연결됨: `{INBOX_DIR.parent.parent}`")
@@ -1571,7 +2229,7 @@ elif page == "⚙️ 설정":
                     if not keys_updated["DB_PATH"]:
                         new_lines.append(f"DB_PATH={check_db}")
                         
-                    ENV_FILE.write_text("\n".join(new_lines), encoding='utf-8')
+                    atomic_write_text(ENV_FILE, "\n".join(new_lines))
                     
                     st.toast("✅ 경로가 성공적으로 저장되었습니다!", icon="🎉")
                     st.success("설정이 저장되었습니다. 적용을 위해 앱을 새로고침합니다.")
@@ -1644,65 +2302,27 @@ elif page == "⚙️ 설정":
     st.markdown("### 🤖 AI 추론 엔진 설정")
     st.caption("질문에 답변할 메인 AI 모델을 선택합니다. 위에서 입력한 API 키가 필요합니다.")
 
-    # 프로바이더별 모델 정의
-    MODELS_BY_PROVIDER = {
-        "anthropic": {
-            "Claude Opus 4.5 (최신)": "claude-opus-4-5-20251101",
-            "Claude Sonnet 4": "claude-sonnet-4-20250514",
-            "Claude Haiku 4.5 (빠름)": "claude-haiku-4-5",
-            "Claude 3.5 Sonnet": "claude-3-5-sonnet-20241022",
-        },
-        "openai": {
-            "GPT-5.2 (최신)": "gpt-5.2-2025-12-11",
-            "GPT-5.1": "gpt-5.1-2025-11-13",
-            "GPT-4.1": "gpt-4.1-2025-04-14",
-            "GPT-4.1 Mini (저렴)": "gpt-4.1-mini-2025-04-14",
-            "GPT-4o": "gpt-4o",
-        },
-        "google": {
-            "Gemini 3 Pro (최신)": "gemini-3-pro-preview",
-            "Gemini 3 Flash": "gemini-3-flash-preview",
-            "Gemini 2.5 Pro": "gemini-2.5-pro",
-            "Gemini 2.5 Flash (추천)": "gemini-2.5-flash",
-            "Gemini 2.0 Flash": "gemini-2.0-flash",
-        },
-    }
-
     # 프로바이더 선택 (라디오 버튼)
     provider = st.radio(
         "사용할 AI 프로바이더",
-        ["Anthropic (Claude)", "OpenAI (GPT)", "Google (Gemini)"],
+        list(PROVIDER_BY_LABEL),
         horizontal=True,
         key="api_provider_select"
     )
-
-    # 프로바이더 매핑
-    provider_map = {
-        "Anthropic (Claude)": "anthropic",
-        "OpenAI (GPT)": "openai",
-        "Google (Gemini)": "google",
-    }
-    selected_provider = provider_map[provider]
+    selected_provider = PROVIDER_BY_LABEL[provider]
 
     # 선택된 프로바이더의 모델만 표시
     model_options = MODELS_BY_PROVIDER[selected_provider]
+    model_labels = list(model_options)
 
     current_model = settings.get("RAG_MODEL", "gemini-2.5-pro")
-    # 현재 모델이 선택된 프로바이더에 있는지 확인
-    current_model_display = next(
-        (k for k, v in model_options.items() if v == current_model),
-        list(model_options.keys())[0]  # 없으면 첫 번째 모델
-    )
-
-    # 현재 모델이 리스트에 없으면 인덱스 0 사용
-    try:
-        model_index = list(model_options.keys()).index(current_model_display)
-    except ValueError:
-        model_index = 0
+    # 현재 모델이 선택된 프로바이더에 없으면 첫 번째 모델
+    current_model_display = MODEL_LABELS_BY_ID[selected_provider].get(current_model, model_labels[0])
+    model_index = model_labels.index(current_model_display)
 
     selected_model_display = st.selectbox(
         f"{provider} 모델",
-        list(model_options.keys()),
+        model_labels,
         index=model_index,
         key="rag_model_select"
     )
@@ -1755,11 +2375,9 @@ elif page == "⚙️ 설정":
     st.markdown("---")
     st.markdown("### 📖 사용 가이드")
 
-    GUI_GUIDE_PATH = KIT_ROOT / "docs" / "GUI_GUIDE.md"
-    
-    if GUI_GUIDE_PATH.exists():
+    guide_content = read_text_file(str(GUI_GUIDE_PATH), file_mtime_ns(GUI_GUIDE_PATH))
+    if guide_content is not None:
         with st.expander("Cloud Edition 사용 설명서 보기", expanded=False):
-            guide_content = GUI_GUIDE_PATH.read_text(encoding="utf-8")
             st.markdown(guide_content)
     
 
@@ -1770,19 +2388,19 @@ elif page == "⚙️ 설정":
 
     col1, col2, col3 = st.columns(3)
     with col1:
-        if settings.get("ANTHROPIC_API_KEY"):
+        if saved_anthropic_key:
             st.success("✅ Anthropic")
         else:
             st.warning("⚠️ Anthropic 미설정")
 
     with col2:
-        if settings.get("OPENAI_API_KEY"):
+        if saved_openai_key:
             st.success("✅ OpenAI")
         else:
             st.info("ℹ️ OpenAI 미설정")
 
     with col3:
-        if settings.get("GOOGLE_API_KEY"):
+        if saved_google_key:
             st.success("✅ Google")
         else:
             st.info("ℹ️ Google 미설정")
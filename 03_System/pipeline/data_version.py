@@ -0,0 +1,40 @@
+"""
+Write stamp for the vector DB.
+
+Chroma touches chroma.sqlite3 just by opening a client, so file mtimes
+cannot tell whether the *data* changed. Every writer that adds, upserts
+or deletes chunks calls bump_data_version(); caches persisted next to the
+DB (source summary, BM25 index) are keyed on the stamp it leaves behind.
+"""
+
+import os
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Union
+
+# Lives inside the DB folder so a DB reset or a swapped-in DB takes it along
+DATA_VERSION_FILE = ".data_version"
+
+
+def read_data_version(db_dir: Union[str, Path]) -> str:
+    """Returns the current write stamp ("" if no writer has stamped this DB yet)."""
+    try:
+        return (Path(db_dir) / DATA_VERSION_FILE).read_text(encoding="utf-8").strip()
+    except OSError:
+        return ""
+
+
+def bump_data_version(db_dir: Union[str, Path]) -> str:
+    """Records that the DB contents changed; returns the new stamp."""
+    db_dir = Path(db_dir)
+    stamp = uuid.uuid4().hex
+    fd, tmp_name = tempfile.mkstemp(dir=db_dir, prefix=f"{DATA_VERSION_FILE}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(stamp)
+        os.replace(tmp_name, db_dir / DATA_VERSION_FILE)
+    finally:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+    return stamp
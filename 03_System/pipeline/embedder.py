@@ -1,5 +1,8 @@
 import torch
 import gc
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from typing import List, Optional
 from sentence_transformers import SentenceTransformer
 import logging
@@ -8,6 +11,40 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("Embedder")
 
+# Recently embedded search queries kept per embedder instance
+QUERY_CACHE_SIZE = 512
+# CUDA encodes a whole add_documents call at once with this micro-batch size
+CUDA_ENCODE_BATCH = 128
+
+
+def detect_device() -> str:
+    """Returns the best available torch device: mps, cuda, or cpu."""
+    if torch.backends.mps.is_available():
+        return "mps"
+    elif torch.cuda.is_available():
+        return "cuda"
+    return "cpu"
+
+
+@lru_cache(maxsize=None)
+def get_sentence_transformer(model_name: str, device: str) -> SentenceTransformer:
+    """
+    Process-wide model cache. Every caller asking for the same model/device
+    shares one set of weights instead of loading its own copy.
+    """
+    logger.info(f"🧠 Loading {model_name}...")
+    model = SentenceTransformer(
+        model_name,
+        device=device,
+        trust_remote_code=True
+    )
+    if device == "cuda":
+        # FP16 weights halve VRAM traffic; normalized cosine scores are unaffected
+        model.half()
+    logger.info("✅ Model loaded successfully.")
+    return model
+
+
 class TheologyEmbedder:
     """
     Hardware-adaptive embedding service for Theology AI Lab v4.
@@ -17,30 +54,35 @@ class TheologyEmbedder:
         self.model_name = model_name
         self.device = self._detect_device()
         self.model = None
+        self._query_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._query_lock = threading.Lock()
         logger.info(f"🚀 Initializing TheologyEmbedder on device: {self.device}")
 
     def _detect_device(self) -> str:
-        if torch.backends.mps.is_available():
-            return "mps"
-        elif torch.cuda.is_available():
-            return "cuda"
-        return "cpu"
+        return detect_device()
 
     def load_model(self):
         """Lazy loading of the model to save memory until needed."""
         if self.model is None:
-            logger.info(f"🧠 Loading {self.model_name}...")
-            self.model = SentenceTransformer(
-                self.model_name, 
-                device=self.device,
-                trust_remote_code=True
-            )
-            logger.info("✅ Model loaded successfully.")
+            self.model = get_sentence_transformer(self.model_name, self.device)
 
     def embed_documents(self, texts: List[str], batch_size: int = 16) -> List[List[float]]:
         if self.model is None:
             self.load_model()
             
+        # CUDA: one encode call for the whole input; sentence-transformers sorts
+        # by length and batches internally, so no Python-level chunk loop is needed
+        if self.device == "cuda":
+            embeddings = self.model.encode(
+                texts,
+                batch_size=max(batch_size, CUDA_ENCODE_BATCH),
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+            self._clear_memory()
+            return embeddings.tolist()
+
         # Adjust batch size based on hardware (MPS has limited VRAM)
         if self.device == "mps":
             batch_size = 2  # Very conservative for MPS to prevent OOM
@@ -70,10 +112,40 @@ class TheologyEmbedder:
         self._clear_memory()
         return all_embeddings
     
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeds search queries in one batched forward pass.
+        Repeated queries are served from an LRU cache; the per-batch memory
+        clearing of embed_documents is skipped since queries are short.
+        Thread-safe: the app runs expanded queries concurrently.
+        """
+        if self.model is None:
+            self.load_model()
+
+        with self._query_lock:
+            missing = list(dict.fromkeys(t for t in texts if t not in self._query_cache))
+            if missing:
+                vectors = self.model.encode(
+                    missing,
+                    batch_size=32,
+                    show_progress_bar=False,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True
+                )
+                for text, vec in zip(missing, vectors.tolist()):
+                    self._query_cache[text] = vec
+
+            result = []
+            for t in texts:
+                self._query_cache.move_to_end(t)
+                result.append(self._query_cache[t])
+            while len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+            return result
+
     def embed_query(self, text: str) -> List[float]:
         """Embed a single query - LangChain Embeddings interface compatibility."""
-        result = self.embed_documents([text])
-        return result[0]
+        return self.embed_queries([text])[0]
 
     def _clear_memory(self):
         gc.collect()
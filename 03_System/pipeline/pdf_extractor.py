@@ -0,0 +1,75 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import fitz  # PyMuPDF
+
+logger = logging.getLogger("PdfExtractor")
+
+# Only large documents are worth the worker start-up cost (spawn: a fresh
+# interpreter + fitz import per worker). Re-measure on the target machine with
+#   python -m pipeline.pdf_extractor some.pdf
+PARALLEL_MIN_PAGES = 200
+PAGES_PER_TASK = 100
+# Each worker opens its own copy of the PDF; more than this rarely pays off
+PARALLEL_MAX_WORKERS = 4
+
+
+def _extract_page_range(file_path: str, start: int, end: int) -> List[Dict[str, Any]]:
+    """Worker: extracts raw text for 0-indexed pages [start, end)."""
+    with fitz.open(file_path) as doc:
+        return [{"page": i + 1, "text": doc[i].get_text()} for i in range(start, end)]
+
+
+def extract_pages(file_path: str, max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Extracts the text layer of every page as [{"page": n, "text": ...}, ...].
+    Large PDFs are split into page ranges and processed across CPU cores.
+    Kept free of torch/langchain imports so worker processes start quickly;
+    under spawn (macOS/Windows) workers also re-import the caller's __main__,
+    so processor_v4 keeps its heavy imports inside functions as well.
+    """
+    with fitz.open(file_path) as doc:
+        total_pages = len(doc)
+
+    workers = max_workers or min(os.cpu_count() or 1, PARALLEL_MAX_WORKERS)
+    if total_pages < PARALLEL_MIN_PAGES or workers < 2:
+        return _extract_page_range(file_path, 0, total_pages)
+
+    try:
+        return _extract_parallel(file_path, total_pages, workers)
+    except Exception as e:
+        logger.warning(f"⚠️ Parallel extraction failed ({e}). Falling back to sequential.")
+        return _extract_page_range(file_path, 0, total_pages)
+
+
+def _extract_parallel(file_path: str, total_pages: int, workers: int) -> List[Dict[str, Any]]:
+    """Splits the document into PAGES_PER_TASK ranges and extracts them in a process pool."""
+    starts = list(range(0, total_pages, PAGES_PER_TASK))
+    ends = [min(s + PAGES_PER_TASK, total_pages) for s in starts]
+    workers = min(workers, len(starts))
+    logger.info(f"⚡ Parallel text extraction: {total_pages} pages / {workers} workers")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        ranges = executor.map(_extract_page_range, [file_path] * len(starts), starts, ends)
+        return [page for pages in ranges for page in pages]
+
+
+if __name__ == "__main__":
+    # Benchmark for PARALLEL_MIN_PAGES: sequential vs. process pool on one PDF
+    import sys
+    import time
+
+    path = sys.argv[1]
+    with fitz.open(path) as doc:
+        pages = len(doc)
+
+    workers = min(os.cpu_count() or 1, PARALLEL_MAX_WORKERS)
+    t0 = time.perf_counter()
+    _extract_page_range(path, 0, pages)
+    t1 = time.perf_counter()
+    _extract_parallel(path, pages, workers)
+    t2 = time.perf_counter()
+    print(f"{pages} pages: sequential {t1 - t0:.2f}s, "
+          f"{workers} workers {t2 - t1:.2f}s (threshold: {PARALLEL_MIN_PAGES} pages)")
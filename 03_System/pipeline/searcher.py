@@ -1,4 +1,4 @@
-from typing import List, Any
+from typing import List, Any, Optional
 from langchain_chroma import Chroma
 from langchain_community.retrievers import BM25Retriever
 from langchain_classic.retrievers import EnsembleRetriever
@@ -16,10 +16,17 @@ class TheologySearcher:
         self.vector_db = vector_db
         self.retriever = None
 
-    def build_ensemble(self, all_docs: List[Document], k: int = 8):
+    @staticmethod
+    def build_bm25(all_docs: List[Document]) -> BM25Retriever:
+        """Builds the BM25 index over all docs (picklable, so callers may persist it)."""
+        return BM25Retriever.from_documents(all_docs)
+
+    def build_ensemble(self, all_docs: Optional[List[Document]] = None, k: int = 8,
+                       bm25_retriever: Optional[BM25Retriever] = None):
         """
         Initializes the Hybrid Retriever. 
-        Requires all docs loaded initially for BM25 index.
+        Requires all docs loaded initially for BM25 index,
+        unless a previously built bm25_retriever is passed in.
         """
         logger.info(f"🚀 Building Ensemble Retriever (k={k})...")
         
@@ -29,7 +36,8 @@ class TheologySearcher:
         )
         
         # 2. Lexical (BM25) Retriever
-        bm25_retriever = BM25Retriever.from_documents(all_docs)
+        if bm25_retriever is None:
+            bm25_retriever = self.build_bm25(all_docs)
         bm25_retriever.k = k
         
         # 3. Combine with Weights (0.7 Semantic / 0.3 Keyword)
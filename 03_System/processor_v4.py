@@ -7,7 +7,7 @@ import shutil
 from pathlib import Path
 from datetime import datetime
 import fitz  # PyMuPDF
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 
 # OCR Support
 try:
@@ -22,11 +22,15 @@ except ImportError:
 SCRIPT_DIR = Path(__file__).parent.absolute()
 sys.path.insert(0, str(SCRIPT_DIR))
 
-from pipeline.embedder import TheologyEmbedder
+# torch/sentence-transformers/langchain are imported where they are used, not here:
+# on macOS/Windows (spawn) every extract_pages worker re-imports this module
 from pipeline.semantic_chunker import SemanticChunker
 from pipeline.router import ArchiveRouter
-from langchain_chroma import Chroma
-from langchain_core.documents import Document
+from pipeline.pdf_extractor import extract_pages
+from pipeline.data_version import bump_data_version
+
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
 
 # Logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -38,6 +42,8 @@ class ProjectV4Processor:
     OCR_LANG = "kor+deu+eng+grc+heb"
     
     def __init__(self, db_dir: str):
+        from pipeline.embedder import TheologyEmbedder
+
         self.db_dir = db_dir
         self.embedder = TheologyEmbedder()
         self.chunker = SemanticChunker()
@@ -73,11 +79,15 @@ class ProjectV4Processor:
         
     def _init_db(self):
         if self.vector_db is None:
+            from langchain_chroma import Chroma
+
             try:
                 self.vector_db = Chroma(
                     persist_directory=self.db_dir,
                     embedding_function=self.embedder,  # Pass the object, not a lambda
-                    collection_name="theology_library"
+                    collection_name="theology_library",
+                    # Embeddings are L2-normalized, so cosine distance is a plain dot product
+                    collection_metadata={"hnsw:space": "cosine"}
                 )
             except Exception as e:
                 logger.error(f"❌ DB Init Error: {e}. Attempting to proceed with fresh init if empty.")
@@ -85,7 +95,7 @@ class ProjectV4Processor:
                 # we might need to rely on the client ensuring it exists.
                 # For now, just logging.
 
-    def process_file(self, file_path: Path) -> List[Document]:
+    def process_file(self, file_path: Path) -> List["Document"]:
         """Extracts text from PDF/EPUB/TXT and returns chunked documents."""
         logger.info(f"📄 Processing: {file_path.name}")
         
@@ -251,7 +261,8 @@ class ProjectV4Processor:
                 
                 if chunks:
                     # 4. DB 인덱싱 (배치 단위로 OOM 방지)
-                    BATCH_SIZE = 100  # Optimized for Colab T4 (was 10 for MPS)
+                    # Larger batches on CUDA: each add_documents call is encoded in one pass
+                    BATCH_SIZE = 512 if self.embedder.device == "cuda" else 100  # 100: Colab T4 safe default (was 10 for MPS)
                     total_batches = (len(chunks) + BATCH_SIZE - 1) // BATCH_SIZE
                     
                     for batch_idx in range(total_batches):
@@ -270,6 +281,9 @@ class ProjectV4Processor:
                         
                         self.vector_db.add_documents(batch)
                     
+                    # Invalidate caches persisted next to the DB (source summary, BM25 index)
+                    bump_data_version(self.db_dir)
+                    
                     # 5. JSON 아카이브 저장
                     source_name = file_path.stem
                     json_archive_path = archive_dir / f"{source_name}.json"
@@ -289,8 +303,9 @@ class ProjectV4Processor:
                         ]
                     }
                     
+                    # Compact JSON: archives are machine-read only (reindex, BM25 corpus)
                     with open(json_archive_path, "w", encoding="utf-8") as f:
-                        json.dump(chunk_data, f, ensure_ascii=False, indent=2)
+                        json.dump(chunk_data, f, ensure_ascii=False, separators=(",", ":"))
                     
                     # 6. Sidecar JSON 이동 (존재 시)
                     if sidecar_path and sidecar_path.exists():
@@ -347,8 +362,10 @@ class ProjectV4Processor:
             "session_stats": session_stats
         }
     
-    def process_file_with_metadata(self, file_path: Path, parsed_meta) -> List[Document]:
+    def process_file_with_metadata(self, file_path: Path, parsed_meta) -> List["Document"]:
         """Process file with parsed metadata using Semantic Chunker."""
+        from langchain_core.documents import Document
+
         logger.info(f"📄 Processing: {file_path.name} (Type: {parsed_meta.doc_type})")
         
         # Build base metadata
@@ -379,13 +396,12 @@ class ProjectV4Processor:
                 logger.error(f"Failed to read TXT {file_path.name}: {e}")
                 return []
         
-        # PDF/EPUB (PyMuPDF)
+        # PDF/EPUB (PyMuPDF, 대용량은 페이지 구간별 병렬 추출)
         else:
             try:
-                doc = fitz.open(str(file_path))
-                for i, page in enumerate(doc):
-                    page_num = i + 1
-                    text = page.get_text()
+                for page in extract_pages(str(file_path)):
+                    page_num = page["page"]
+                    text = page["text"]
                     
                     # OCR fallback
                     if not text.strip():
@@ -393,7 +409,6 @@ class ProjectV4Processor:
                     
                     if text.strip():
                         pages_content.append({"page": page_num, "text": text})
-                doc.close()
             except Exception as e:
                 logger.error(f"Failed to read PDF/EPUB {file_path.name}: {e}")
                 return []
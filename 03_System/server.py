@@ -224,14 +224,15 @@ def search_theology_db(query: str, n_results: int = 5) -> str:
     # 유사도 검색
     results = collection.query(
         query_embeddings=query_vec,
-        n_results=n_results
+        n_results=n_results,
+        include=["documents", "metadatas"]
     )
 
     # 결과 포맷팅
     response = []
     if results['documents'] and results['documents'][0]:
-        for i, doc in enumerate(results['documents'][0]):
-            meta = results['metadatas'][0][i]
+        docs, metas = results['documents'][0], results['metadatas'][0]
+        for i, (doc, meta) in enumerate(zip(docs, metas)):
             citation = format_citation(meta)
 
             # 청크 연속성 표시
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Make the app packages (pipeline, utils) importable as in the app itself
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from utils.lemma_index import (
+    LemmaIndexNotV1,
+    lemma_index_v1_pairs,
+    read_lemma_index,
+)
+
+
+def write_index(tmp_path, data):
+    path = tmp_path / "lemma_index.json"
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def test_v1_index_is_converted(tmp_path):
+    path = write_index(tmp_path, {"Gnade": [{"file": "TRE_Bd4.json", "page": 12}]})
+
+    index = read_lemma_index(path)
+
+    assert index["entries"]["Gnade"] == [{"file": "TRE_Bd4.json", "page": 12, "source": "TRE_Bd4"}]
+    assert index["by_source"] == {"TRE_Bd4": {"count": 1, "volumes": []}}
+
+
+def test_v2_index_with_unknown_first_key_is_returned_unchanged(tmp_path):
+    data = {"meta": {"builder": "x"}, "entries": {"Gnade": []}}
+
+    assert read_lemma_index(write_index(tmp_path, data)) == data
+
+
+def test_list_of_non_dicts_under_unknown_key_is_not_treated_as_v1(tmp_path):
+    data = {"tags": ["a", "b"], "entries": {}}
+
+    assert read_lemma_index(write_index(tmp_path, data)) == data
+
+
+def test_v1_pairs_rejects_non_dict_occurrences():
+    with pytest.raises(LemmaIndexNotV1):
+        list(lemma_index_v1_pairs([("tags", ["a", "b"])]))
+
+
+def test_missing_index_returns_none(tmp_path):
+    assert read_lemma_index(tmp_path / "missing.json") is None
@@ -8,12 +8,28 @@
 
 import json
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Set
 from dataclasses import dataclass, field
 
 logger = logging.getLogger("DualSearch")
 
+# Archive JSON 동시 스캔 상한 (Google Drive 등 네트워크 드라이브 대비)
+ARCHIVE_SCAN_WORKERS = 8
+
+# 쿼리 임베딩 LRU 캐시 크기
+QUERY_CACHE_SIZE = 512
+
+# orjson (선택): Archive JSON 디코딩 가속 (없으면 표준 json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Query Expander 임포트
 try:
     from utils.query_expander import QueryExpander, get_search_terms
@@ -55,34 +71,43 @@ class DualSearchEngine:
     def __init__(self, 
                  db_path: str, 
                  archive_path: str,
-                 use_trilingual: bool = True):
+                 use_trilingual: bool = True,
+                 client=None):
         """
         Args:
             db_path: ChromaDB 경로
             archive_path: Archive JSON 디렉토리 경로
             use_trilingual: 3중 언어 확장 사용 여부
+            client: 이미 열린 ChromaDB 클라이언트 (없으면 db_path로 새로 연결)
         """
         self.db_path = Path(db_path)
         self.archive_path = Path(archive_path)
         self.use_trilingual = use_trilingual and EXPANDER_AVAILABLE
+        self._client = client
         
         self.expander = QueryExpander() if self.use_trilingual else None
         self._vector_db = None
         self._embedder = None
+        self._query_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        # 앱에서는 세션 간 공유되므로 캐시 조회/삽입/축출을 한 번에 보호
+        self._query_lock = threading.Lock()
         
     def _get_vector_db(self):
         """Lazy load ChromaDB"""
         if self._vector_db is None:
-            import chromadb
-            client = chromadb.PersistentClient(path=str(self.db_path))
-            self._vector_db = client.get_or_create_collection("theology_library")
+            if self._client is None:
+                import chromadb
+                self._client = chromadb.PersistentClient(path=str(self.db_path))
+            self._vector_db = self._client.get_or_create_collection(
+                "theology_library", metadata={"hnsw:space": "cosine"}
+            )
         return self._vector_db
     
     def _get_embedder(self):
-        """Lazy load embedder"""
+        """Lazy load embedder (앱/인덱서와 동일한 BGE-M3 인스턴스 공유)"""
         if self._embedder is None:
-            from sentence_transformers import SentenceTransformer
-            self._embedder = SentenceTransformer("BAAI/bge-m3")
+            from pipeline.embedder import detect_device, get_sentence_transformer
+            self._embedder = get_sentence_transformer("BAAI/bge-m3", detect_device())
         return self._embedder
     
     def search(self, 
@@ -90,7 +115,8 @@ class DualSearchEngine:
                n_results: int = 10,
                source_filter: Optional[str] = None,
                doc_type_filter: Optional[str] = None,
-               tag_filter: Optional[List[str]] = None) -> List[SearchResult]:
+               tag_filter: Optional[List[str]] = None,
+               query_embedding: Optional[List[float]] = None) -> List[SearchResult]:
         """
         이중 검색 실행.
         
@@ -100,12 +126,17 @@ class DualSearchEngine:
             source_filter: 소스 필터 (예: "TDNT", "Barth")
             doc_type_filter: 도서 유형 필터 (dogmatics, dictionary, etc.)
             tag_filter: 태그 필터 리스트
+            query_embedding: 호출 측에서 이미 계산한 query 임베딩 (있으면 재인코딩 생략)
             
         Returns:
             SearchResult 리스트
         """
         logger.info(f"🔍 Dual Search: '{query}'")
         
+        if query_embedding is not None:
+            with self._query_lock:
+                self._query_cache[query] = list(query_embedding)
+
         # 1. 쿼리 확장 (3중 언어)
         search_terms = self._expand_query(query)
         logger.info(f"   └─ Search terms: {search_terms[:5]}...")
@@ -130,38 +161,61 @@ class DualSearchEngine:
     def _expand_query(self, query: str) -> List[str]:
         """쿼리를 다국어로 확장"""
         if self.use_trilingual and self.expander:
-            return get_search_terms(query)
+            # 원래 쿼리를 맨 앞에 두어 벡터 검색(terms[:3])에 항상 포함 (미리 계산된 임베딩 재사용)
+            terms = get_search_terms(query)
+            return [query] + [t for t in terms if t != query]
         return [query]
     
+    def _embed_queries(self, terms: List[str]) -> List[List[float]]:
+        """검색어 임베딩 (캐시 미스만 한 번의 배치로 인코딩, 스레드 안전)"""
+        with self._query_lock:
+            missing = [t for t in dict.fromkeys(terms) if t not in self._query_cache]
+            if missing:
+                embedder = self._get_embedder()
+                vectors = embedder.encode(missing, batch_size=32, normalize_embeddings=True).tolist()
+                for term, vec in zip(missing, vectors):
+                    self._query_cache[term] = vec
+
+            embeddings = []
+            for t in terms:
+                self._query_cache.move_to_end(t)
+                embeddings.append(self._query_cache[t])
+
+            while len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+
+            return embeddings
+
     def _search_vector(self, terms: List[str], n: int) -> List[SearchResult]:
         """Vector DB 검색"""
         results = []
         try:
             collection = self._get_vector_db()
-            embedder = self._get_embedder()
             
-            # 각 검색어에 대해 임베딩 생성
-            query_embeddings = embedder.encode(terms[:3]).tolist()  # 상위 3개만
+            # 상위 3개 검색어 임베딩 → 단일 query 호출로 일괄 검색
+            query_embeddings = self._embed_queries(terms[:3])
+
+            raw = collection.query(
+                query_embeddings=query_embeddings,
+                n_results=n // len(query_embeddings) + 1,
+                include=["documents", "metadatas"]  # 거리/임베딩은 사용하지 않음
+            )
             
-            for i, emb in enumerate(query_embeddings):
-                raw = collection.query(
-                    query_embeddings=[emb],
-                    n_results=n // len(query_embeddings) + 1
-                )
-                
-                if raw['documents'] and raw['documents'][0]:
-                    for j, doc in enumerate(raw['documents'][0]):
-                        meta = raw['metadatas'][0][j] if raw['metadatas'] else {}
-                        results.append(SearchResult(
-                            content=doc,
-                            source=meta.get('source', 'Unknown'),
-                            author=meta.get('author', 'Unknown'),
-                            doc_type=meta.get('doc_type', 'general'),
-                            page=meta.get('page_number'),
-                            score=1.0 - (j * 0.05),  # 순위 기반 점수
-                            method="vector",
-                            metadata=meta
-                        ))
+            for i in range(len(query_embeddings)):
+                docs = raw['documents'][i] if raw['documents'] else []
+                metas = raw['metadatas'][i] if raw['metadatas'] else []
+                for j, doc in enumerate(docs):
+                    meta = metas[j] if metas else {}
+                    results.append(SearchResult(
+                        content=doc,
+                        source=meta.get('source', 'Unknown'),
+                        author=meta.get('author', 'Unknown'),
+                        doc_type=meta.get('doc_type', 'general'),
+                        page=meta.get('page_number'),
+                        score=1.0 - (j * 0.05),  # 순위 기반 점수
+                        method="vector",
+                        metadata=meta
+                    ))
         except Exception as e:
             logger.error(f"Vector search failed: {e}")
         
@@ -177,59 +231,75 @@ class DualSearchEngine:
         # 검색어를 소문자로 정규화
         terms_lower = [t.lower() for t in terms]
         
-        json_files = list(self.archive_path.glob("*.json"))
+        json_files = list(self.archive_path.glob("*.json"))[:50]  # 최대 50개 파일
+        if not json_files:
+            return results
+
+        # 파일 단위 병렬 스캔 (클라우드 드라이브 I/O 대기 시간 중첩)
+        workers = min(ARCHIVE_SCAN_WORKERS, len(json_files))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for file_results in executor.map(
+                lambda jf: self._scan_archive_file(jf, terms, terms_lower), json_files
+            ):
+                results.extend(file_results)
         
-        for jf in json_files[:50]:  # 최대 50개 파일
-            try:
-                with open(jf, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                chunks = data.get('chunks', data) if isinstance(data, dict) else data
-                if not isinstance(chunks, list):
+        # 점수 순 정렬
+        results.sort(key=lambda x: x.score, reverse=True)
+        return results[:n]
+
+    def _scan_archive_file(self,
+                           jf: Path,
+                           terms: List[str],
+                           terms_lower: List[str]) -> List[SearchResult]:
+        """단일 Archive JSON 파일 키워드 매칭"""
+        results = []
+        try:
+            with open(jf, 'rb') as f:
+                data = orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
+
+            chunks = data.get('chunks', data) if isinstance(data, dict) else data
+            if not isinstance(chunks, list):
+                return results
+
+            for chunk in chunks:
+                content = chunk.get('content', chunk.get('text', ''))
+                if not content:
                     continue
                 
-                for chunk in chunks:
-                    content = chunk.get('content', chunk.get('text', ''))
-                    if not content:
-                        continue
-                    
-                    content_lower = content.lower()
+                content_lower = content.lower()
+
+                # 매칭 점수 계산
+                score = sum(1 for t in terms_lower if t in content_lower)
+
+                if score > 0:
+                    meta = chunk.get('metadata', chunk)
+                    final_score = score / len(terms)
                     
-                    # 매칭 점수 계산
-                    score = sum(1 for t in terms_lower if t in content_lower)
+                    # [Bonus 1] 청크 시작 부분 일치 (표제어 가능성)
+                    # 검색어가 청크의 맨 앞부분(50자 이내)에 등장하면 강력한 보너스
+                    first_term = terms_lower[0]
+                    if first_term in content_lower[:min(len(content), 50)]:
+                         final_score += 2.0
                     
-                    if score > 0:
-                        meta = chunk.get('metadata', chunk)
-                        final_score = score / len(terms)
-                        
-                        # [Bonus 1] 청크 시작 부분 일치 (표제어 가능성)
-                        # 검색어가 청크의 맨 앞부분(50자 이내)에 등장하면 강력한 보너스
-                        first_term = terms[0].lower()
-                        if first_term in content_lower[:min(len(content), 50)]:
-                             final_score += 2.0
-                        
-                        # [Bonus 2] 사전류(dictionary) 가산점
-                        if meta.get('doc_type') == 'dictionary':
-                            final_score += 0.5
+                    # [Bonus 2] 사전류(dictionary) 가산점
+                    if meta.get('doc_type') == 'dictionary':
+                        final_score += 0.5
 
-                        results.append(SearchResult(
-                            content=content,
-                            source=meta.get('source', jf.stem),
-                            author=meta.get('author', 'Unknown'),
-                            doc_type=meta.get('doc_type', 'general'),
-                            page=meta.get('page_number'),
-                            score=final_score,
-                            method="json",
-                            metadata=meta
-                        ))
-                        
-            except Exception as e:
-                logger.debug(f"Error reading {jf}: {e}")
-                continue
+                    results.append(SearchResult(
+                        content=content,
+                        source=meta.get('source', jf.stem),
+                        author=meta.get('author', 'Unknown'),
+                        doc_type=meta.get('doc_type', 'general'),
+                        page=meta.get('page_number'),
+                        score=final_score,
+                        method="json",
+                        metadata=meta
+                    ))
+
+        except Exception as e:
+            logger.debug(f"Error reading {jf}: {e}")
         
-        # 점수 순 정렬
-        results.sort(key=lambda x: x.score, reverse=True)
-        return results[:n]
+        return results
     
     def _merge_results(self, 
                        vector: List[SearchResult], 
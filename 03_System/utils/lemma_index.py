@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+📖 Lemma 인덱스 로더
+====================
+lemma_index.json을 읽어 v2.0 형식으로 반환.
+구버전(v1.0) 파일은 v2.0 형식으로 변환 (ijson이 있으면 스트리밍으로 변환).
+
+형식 판별 기준은 최상위 "entries" 키의 존재 여부:
+    v1.0: {"lemma": [{file, page}, ...], ...}
+    v2.0: {"entries": {...}, "by_category": {}, "by_source": {...}, "updated_at": ...}
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+# orjson (선택): 전체 로드 가속 (없으면 표준 json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# ijson (선택): 구버전(v1.0) 인덱스를 중간 dict 없이 스트리밍 변환
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# v2.0 인덱스의 최상위 키 (첫 키가 이 중 하나면 스트리밍 변환을 시도하지 않음)
+LEMMA_INDEX_V2_KEYS = {"version", "updated_at", "entries", "by_category", "by_source"}
+
+
+class LemmaIndexNotV1(Exception):
+    """스트리밍 변환 중 v1.0 형식이 아님을 발견"""
+
+
+def first_top_level_key(f) -> Optional[str]:
+    """JSON 객체의 첫 최상위 키 (값은 읽지 않음, 객체가 아니거나 비어 있으면 None)"""
+    for _, event, value in ijson.parse(f):
+        if event == "map_key":
+            return value
+        if event != "start_map":
+            return None
+    return None
+
+
+def lemma_index_v1_pairs(pairs: Iterable[Tuple[str, Any]]):
+    """
+    v1.0 형식의 (표제어, 출현 목록) 쌍만 통과
+
+    "entries" 키, 목록이 아닌 값, dict가 아닌 출현 항목이 보이면
+    LemmaIndexNotV1을 발생시켜 전체 로드 판별로 넘깁니다.
+    """
+    for lemma, occurrences in pairs:
+        if lemma == "entries" or not isinstance(occurrences, list):
+            raise LemmaIndexNotV1(lemma)
+        if not all(isinstance(occ, dict) for occ in occurrences):
+            raise LemmaIndexNotV1(lemma)
+        yield lemma, occurrences
+
+
+def convert_lemma_index_v1(pairs: Iterable[Tuple[str, Any]]) -> Dict[str, Any]:
+    """v1.0 형식 → v2.0 형식으로 변환"""
+    entries = {}
+    by_source = {}
+
+    for lemma, occurrences in pairs:
+        entries[lemma] = []
+        for occ in occurrences:
+            source_file = occ.get("file", "")
+            source_name = source_file.replace(".json", "") if source_file else "Unknown"
+            page = occ.get("page", 0)
+
+            entries[lemma].append({
+                "file": source_file,
+                "page": page,
+                "source": source_name
+            })
+
+            # by_source 집계
+            if source_name not in by_source:
+                by_source[source_name] = {"count": 0, "volumes": []}
+            by_source[source_name]["count"] += 1
+
+    return {
+        "version": "1.0 (converted)",
+        "updated_at": datetime.now().isoformat(),
+        "entries": entries,
+        "by_category": {},  # v1.0에는 카테고리 정보 없음
+        "by_source": by_source
+    }
+
+
+def read_lemma_index(index_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """
+    Lemma 인덱스 로드 (v1.0 및 v2.0 형식 모두 지원, 파일이 없으면 None)
+    """
+    index_path = Path(index_path)
+    if not index_path.exists():
+        return None
+    with open(index_path, "rb") as f:
+        if IJSON_AVAILABLE and first_top_level_key(f) not in LEMMA_INDEX_V2_KEYS:
+            # v1.0으로 보이면 중간 dict 없이 스트리밍 변환
+            # (v1.0이 아닌 징후가 보이면 아래 전체 로드로 판별)
+            f.seek(0)
+            try:
+                return convert_lemma_index_v1(
+                    lemma_index_v1_pairs(ijson.kvitems(f, "", use_float=True))
+                )
+            except LemmaIndexNotV1:
+                pass
+        f.seek(0)
+        data = orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
+
+    # v2.0 형식인지 확인 (entries 키가 있는지)
+    if "entries" in data:
+        return data
+    return convert_lemma_index_v1(data.items())
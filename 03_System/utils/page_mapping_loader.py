@@ -21,7 +21,7 @@ AI 없이 사용자가 직접 매핑 파일을 작성하여 정확한 페이지
 
 import json
 from pathlib import Path
-from typing import Dict, Optional, List, Any, Union
+from typing import Dict, Optional, Any, Union, Set
 from dataclasses import dataclass
 
 
@@ -84,7 +84,7 @@ def _process_samples_mapping(data: dict, filename: str) -> MappingResult:
     samples = sorted(samples, key=lambda x: x['pdf'])
 
     page_map: Dict[int, Optional[int]] = {}
-    irregulars: List[int] = []  # 불규칙 페이지 (도판 등)
+    irregulars: Set[int] = set()  # 불규칙 페이지 (도판 등), 보간 시 O(1) 조회
 
     # 유효한 샘플만 추출 (print가 숫자인 것)
     valid_samples = [
@@ -106,7 +106,7 @@ def _process_samples_mapping(data: dict, filename: str) -> MappingResult:
         if print_page is None:
             # 도판, 빈 페이지 등
             page_map[pdf_page] = None
-            irregulars.append(pdf_page)
+            irregulars.add(pdf_page)
 
     # 샘플 간 보간
     for i in range(len(valid_samples)):
@@ -121,23 +121,15 @@ def _process_samples_mapping(data: dict, filename: str) -> MappingResult:
         if i + 1 < len(valid_samples):
             next_sample = valid_samples[i + 1]
             pdf_next = next_sample['pdf']
-            print_next = next_sample['print']
 
-            # 두 샘플 간 오프셋이 동일한지 확인
-            offset_curr = pdf_curr - print_curr
-            offset_next = pdf_next - print_next
-
-            if offset_curr == offset_next:
-                # 오프셋 일관: 선형 보간
-                for pdf_p in range(pdf_curr + 1, pdf_next):
-                    if pdf_p not in irregulars:
-                        page_map[pdf_p] = pdf_p - int(offset_curr)
-            else:
-                # 오프셋 불일치: 불규칙 구간 존재
-                # 가능한 범위만 추정 (앞 샘플 오프셋 적용)
-                for pdf_p in range(pdf_curr + 1, pdf_next):
-                    if pdf_p not in irregulars:
-                        page_map[pdf_p] = pdf_p - int(offset_curr)
+            # 오프셋이 같으면 선형 보간, 다르면 (불규칙 구간 존재)
+            # 가능한 범위만 추정 — 두 경우 모두 앞 샘플 오프셋 적용
+            offset_curr = int(pdf_curr - print_curr)
+            page_map.update(
+                (pdf_p, pdf_p - offset_curr)
+                for pdf_p in range(pdf_curr + 1, pdf_next)
+                if pdf_p not in irregulars
+            )
 
     # 마지막 샘플 이후 확장 (오프셋 유지)
     if valid_samples:
@@ -21,6 +21,13 @@ from typing import List, Dict, Any, Tuple
 import chromadb
 from sentence_transformers import SentenceTransformer
 
+# orjson (optional): faster archive JSON decoding
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # BM25 (optional, graceful fallback)
 try:
     from rank_bm25 import BM25Okapi
@@ -91,8 +98,8 @@ def load_bm25_corpus() -> Tuple[List[str], List[Dict], 'BM25Okapi']:
     json_files = list(archive_path.glob("*.json"))
     for jf in json_files:
         try:
-            with open(jf, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(jf, 'rb') as f:
+                data = orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
                 if isinstance(data, list):
                     for chunk in data:
                         text = chunk.get('text', chunk.get('content', ''))
@@ -143,12 +150,16 @@ def vector_search(query: str, model, collection, n_results: int = 10,
     query_vec = model.encode([query]).tolist()
     
     fetch_n = n_results * 10 if source_filter else n_results * 2
-    results = collection.query(query_embeddings=query_vec, n_results=fetch_n)
+    results = collection.query(
+        query_embeddings=query_vec,
+        n_results=fetch_n,
+        include=["documents", "metadatas"]
+    )
     
     output = []
     if results['documents'] and results['documents'][0]:
-        for i, doc in enumerate(results['documents'][0]):
-            meta = results['metadatas'][0][i]
+        docs, metas = results['documents'][0], results['metadatas'][0]
+        for i, (doc, meta) in enumerate(zip(docs, metas)):
             if meta is None:
                 continue
             
@@ -185,7 +196,8 @@ def hybrid_search(query: str, source: str = None, n_results: int = 5) -> List[Di
     vector_db = Chroma(
         persist_directory=DB_PATH,
         embedding_function=lambda x: embedder.embed_documents(x),
-        collection_name="theology_library"
+        collection_name="theology_library",
+        collection_metadata={"hnsw:space": "cosine"}
     )
     
     searcher = TheologySearcher(vector_db)
@@ -205,11 +217,12 @@ def hybrid_search(query: str, source: str = None, n_results: int = 5) -> List[Di
     # 3. 검색 실행
     raw_results = searcher.search(query)
     
-    # 4. 소스 필터링 및 포맷 변환
+    # 4. 소스 필터링 및 포맷 변환 (필터 문자열은 루프 밖에서 한 번만 소문자화)
+    needle = source.lower() if source else ""
     output = []
     for r in raw_results:
         meta = r.metadata
-        if source and source.lower() not in meta.get('source', '').lower():
+        if needle and needle not in meta.get('source', '').lower():
             continue
             
         output.append({
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+🧠 Semantic Search Cache for Theology AI Lab
+============================================
+의미가 거의 같은 검색어(예: "Rechtfertigung" / "Rechtfertigungslehre")는
+쿼리 임베딩의 코사인 유사도로 판별하여 이전 검색 결과를 재사용.
+임베딩 + HNSW 조회 대신 메모리 내 행렬-벡터 곱 한 번으로 응답.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+# 보관할 최근 검색 수
+SEMANTIC_CACHE_SIZE = 512
+
+# 이 값보다 유사도가 높으면 같은 검색으로 간주
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+
+class SemanticSearchCache:
+    """
+    쿼리 임베딩 기반 검색 결과 캐시 (스레드 안전).
+
+    결과는 검색 옵션 키(결과에 영향을 주는 모든 검색 인자: 확장 여부, 필터,
+    결과 수, DB 버전 등)가 같은 항목끼리만 비교하므로 다른 설정/이전 DB의
+    결과가 섞이지 않습니다. 조회 결과에는 원래 검색어가 함께 반환되므로
+    호출 측에서 "유사 검색어 결과 재사용" 여부를 표시할 수 있습니다.
+    """
+
+    def __init__(self, maxlen: int = SEMANTIC_CACHE_SIZE,
+                 threshold: float = SEMANTIC_CACHE_THRESHOLD):
+        self.threshold = threshold
+        self._entries: deque = deque(maxlen=maxlen)  # (옵션 키, 정규화 임베딩, 검색어, 결과)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def lookup(self, embedding: List[float], key: Hashable) -> Optional[Tuple[str, Any]]:
+        """유사도가 임계값을 넘는 가장 가까운 이전 (검색어, 결과) (없으면 None)"""
+        with self._lock:
+            candidates = [(vec, query, result) for k, vec, query, result in self._entries if k == key]
+        if not candidates:
+            return None
+
+        query_vec = self._normalize(embedding)
+        scores = np.stack([vec for vec, _, _ in candidates]) @ query_vec
+        best = int(scores.argmax())
+        if scores[best] > self.threshold:
+            _, query, result = candidates[best]
+            return query, result
+        return None
+
+    def add(self, embedding: List[float], key: Hashable, query: str, result: Any) -> None:
+        """검색 결과 저장 (가득 차면 가장 오래된 항목부터 밀려남)"""
+        vec = self._normalize(embedding)
+        with self._lock:
+            self._entries.append((key, vec, query, result))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()